@@ -1,7 +1,7 @@
 import streamlit as st
 from utils.styling import load_css
 from PIL import Image
-import pandas as pd
+from src.dataset import load_dataset
 
 # Set icon and title page
 st.set_page_config(
@@ -54,7 +54,8 @@ st.set_page_config(
 # Load and display dataset
 @st.cache_data
 def read_dataset(path):
-    df = pd.read_csv(path)
+    # All columns, from the typed columnar cache shared with training
+    df = load_dataset(source=path)
     return df
 
 data = read_dataset(r"artifacts/boston.csv")
@@ -1,13 +1,37 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import pickle
+from fastapi import FastAPI, File, HTTPException, Query, Request, UploadFile
+from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError, conint, root_validator, validator
+from pydantic.error_wrappers import ErrorWrapper
+from typing import List, Optional, Union
+import asyncio
+import hmac
+import ipaddress
+import json
+import math
+import tempfile
+import time
 import numpy as np
-import pandas as pd
 from config.config import Config
-from utils.logger import setup_logger
+from src.model_registry import ModelRegistry, ModelValidationError, artifact_signature
+from src.batching import MicroBatcher
+from src.executor import InferenceExecutor
+from src.metrics import BATCH_SIZE, REGISTRY, STAGE_LATENCY, MetricsMiddleware
+from src.prediction_cache import PredictionCache
+from src.validation import INVALID_ROW_POLICIES, BatchValidationError, BatchValidator
+from src.wire_formats import (UnsupportedMediaType, WireFormatError, decode_matrix, encode_predictions,
+                              negotiate, normalize_media_type, report_header)
+from utils.logger import DeferredQueueHandler, SampledLogger, setup_logger
 from fastapi.middleware.cors import CORSMiddleware
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = setup_logger('api')
+prediction_logger = SampledLogger(logger, Config.PREDICTION_LOG_SAMPLE_RATE)
 
 class FeatureInput(BaseModel):
     LSTAT: float
@@ -33,6 +57,96 @@ class FeatureInput(BaseModel):
             }
         }
 
+class ColumnarFeatureInput(BaseModel):
+    """Bulk input with one array per feature (columnar layout)"""
+    LSTAT: List[float]
+    RM: List[float]
+    CRIM: List[float]
+    PTRATIO: List[float]
+    INDUS: List[float]
+    TAX: List[float]
+    NOX: List[float]
+    B: List[float]
+
+    @root_validator(skip_on_failure=True)
+    def check_equal_lengths(cls, values):
+        lengths = {len(column) for column in values.values()}
+        if len(lengths) > 1:
+            raise ValueError("All feature arrays must have the same length")
+        return values
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "LSTAT": [10.0, 5.0],
+                "RM": [6.0, 7.0],
+                "CRIM": [0.1, 0.05],
+                "PTRATIO": [15.0, 18.0],
+                "INDUS": [10.0, 2.5],
+                "TAX": [300.0, 250.0],
+                "NOX": [0.5, 0.45],
+                "B": [300.0, 390.0]
+            }
+        }
+
+class SweepAxis(BaseModel):
+    """One swept feature: explicit ``values``, or ``num`` points from ``start`` to ``stop``.
+
+    ``start``/``stop`` default to the feature's validated range.
+    """
+    feature: str
+    values: Optional[List[float]] = None
+    start: Optional[float] = None
+    stop: Optional[float] = None
+    num: conint(ge=2, le=Config.SENSITIVITY_MAX_POINTS) = Config.SENSITIVITY_DEFAULT_POINTS
+
+    @validator("feature")
+    def check_feature(cls, value):
+        if value not in Config.FEATURE_COLUMNS:
+            raise ValueError(f"Unknown feature {value!r}, expected one of {Config.FEATURE_COLUMNS}")
+        return value
+
+    @validator("values")
+    def check_values(cls, value):
+        if value is not None and not value:
+            raise ValueError("values must not be empty")
+        return value
+
+    @property
+    def size(self):
+        """Number of points grid() returns, known without building it"""
+        return len(self.values) if self.values is not None else self.num
+
+    def grid(self):
+        if self.values is not None:
+            return np.asarray(self.values, dtype=np.float64)
+        bounds = Config.get_feature_range(self.feature)
+        start = bounds['min'] if self.start is None else self.start
+        stop = bounds['max'] if self.stop is None else self.stop
+        return np.linspace(start, stop, self.num)
+
+class SensitivityInput(BaseModel):
+    """Base feature vector plus one (curve) or two (grid) features to sweep"""
+    base: FeatureInput
+    axes: List[SweepAxis]
+
+    @root_validator(skip_on_failure=True)
+    def check_axes(cls, values):
+        axes = values["axes"]
+        if not 1 <= len(axes) <= 2:
+            raise ValueError("Sweep one feature (curve) or two features (grid)")
+        if len({axis.feature for axis in axes}) != len(axes):
+            raise ValueError("Swept features must be different")
+        return values
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "base": FeatureInput.Config.schema_extra["example"],
+                "axes": [{"feature": "RM", "start": 4.0, "stop": 8.0, "num": 41}]
+            }
+        }
+
 # FastAPI instance
 app = FastAPI(
     title=Config.API_TITLE,
@@ -49,46 +163,533 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Request counts, error counts and end-to-end latency per route
+app.add_middleware(MetricsMiddleware, known_paths=lambda: {route.path for route in app.routes})
+
 # Load model and scaler at startup
+registry = ModelRegistry()
 try:
-    with open(Config.MODEL_PATH, 'rb') as f:
-        model = pickle.load(f)
-    with open(Config.SCALER_PATH, 'rb') as f:
-        scaler = pickle.load(f)
-    logger.info("Model and scaler loaded successfully")
+    registry.reload()
+    logger.info(f"Model and scaler loaded successfully (version {registry.version})")
 except Exception as e:
     logger.error(f"Error loading model or scaler: {str(e)}")
     raise HTTPException(status_code=500, detail=f"Error loading model or scaler: {str(e)}")
 
+# Range checks against Config.DATA_VALIDATION, precomputed as bound arrays
+batch_validator = BatchValidator()
+
+# Repeated feature vectors are answered from memory for the loaded model version
+prediction_cache = PredictionCache(
+    maxsize=Config.PREDICTION_CACHE_SIZE,
+    ttl=Config.PREDICTION_CACHE_TTL,
+    precision=Config.PREDICTION_CACHE_PRECISION
+)
+prediction_cache.bind(registry.version)
+
+# Model calls run off the event loop in a thread or process pool
+executor = InferenceExecutor(
+    registry,
+    mode=Config.INFERENCE_EXECUTOR,
+    workers=Config.INFERENCE_WORKERS
+)
+
+# Concurrent single-row requests share one vectorized predict call
+batcher = MicroBatcher(
+    executor.predict_batch,
+    max_batch_size=Config.BATCH_MAX_SIZE,
+    window_ms=Config.BATCH_WINDOW_MS,
+    max_in_flight=executor.workers
+)
+
+def collect_service_metrics():
+    """Cache, batcher and logging counters exposed on /metrics"""
+    cache = prediction_cache.stats()
+    yield "prediction_cache_hits_total", "counter", "Prediction cache hits", [({}, cache["hits"])]
+    yield "prediction_cache_misses_total", "counter", "Prediction cache misses", [({}, cache["misses"])]
+    yield "prediction_cache_evictions_total", "counter", "Entries evicted from the prediction cache", [({}, cache["evictions"])]
+    yield "prediction_cache_entries", "gauge", "Entries in the prediction cache", [({}, cache["size"])]
+    yield "batcher_avg_batch_size", "gauge", "Smoothed /predict micro-batch size", [({}, batcher.avg_batch_size)]
+    yield "log_records_dropped_total", "counter", "Log records dropped because the queue was full", [({}, DeferredQueueHandler.dropped)]
+    yield "model_info", "gauge", "Model version being served", [({"version": registry.version}, 1)]
+
+REGISTRY.add_collector(collect_service_metrics)
+
+def parse_seconds(request, handler_start):
+    """Time from request arrival (set by MetricsMiddleware) to the handler running"""
+    request_start = request.scope.get("state", {}).get("request_start")
+    return handler_start - request_start if request_start is not None else None
+
+async def reload_model(force=False):
+    """Load, validate and atomically swap in the current artifacts"""
+    changed = await run_in_threadpool(registry.reload, force)
+    if changed:
+        prediction_cache.bind(registry.version)
+        await executor.refresh()
+    return changed
+
+async def watch_artifacts():
+    """Reload when the artifact files change and have stopped changing"""
+    last_seen = served = artifact_signature()
+    while True:
+        await asyncio.sleep(Config.MODEL_WATCH_INTERVAL)
+        current = artifact_signature()
+        # Wait for one quiet interval so a retrain that is still writing is not picked up
+        if current == last_seen and current != served:
+            try:
+                await reload_model()
+            except Exception as e:
+                logger.error(f"Error reloading model from changed artifacts: {str(e)}")
+            served = current
+        last_seen = current
+
+watcher_task = None
+
+@app.on_event("startup")
+async def start_inference():
+    global watcher_task
+    await executor.warmup()
+    if Config.BATCHING_ENABLED:
+        await batcher.start()
+    if Config.MODEL_WATCH_INTERVAL > 0:
+        watcher_task = asyncio.get_running_loop().create_task(watch_artifacts())
+
+@app.on_event("shutdown")
+async def stop_inference():
+    if watcher_task is not None:
+        watcher_task.cancel()
+    await batcher.stop()
+    executor.shutdown()
+
+async def predict_single(row, started, log_input):
+    """Validate, look up and predict one row in feature column order; returns (prediction, version)"""
+    violation = batch_validator.first_violation(row)
+    validated = time.perf_counter()
+    STAGE_LATENCY.observe(validated - started, "predict", "validate")
+    if violation is not None:
+        feature, value, low, high = violation
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid value for {feature}: {value}. Expected between {low} and {high}."
+        )
+
+    # Scale and predict straight from the validated fields
+    cache_key = prediction_cache.make_key(row) if Config.PREDICTION_CACHE_ENABLED else None
+    cached = prediction_cache.get(cache_key) if cache_key is not None else None
+    looked_up = time.perf_counter()
+    STAGE_LATENCY.observe(looked_up - validated, "predict", "cache")
+    if cached is not None:
+        final_prediction, model_version = cached
+    else:
+        if Config.BATCHING_ENABLED:
+            final_prediction, model_version = await batcher.submit(row)
+        elif executor.mode == "inline":
+            engine = registry.engine
+            final_prediction, model_version = engine.predict_values(row), engine.version
+            BATCH_SIZE.observe(1, "predict")
+        else:
+            predictions, model_version = await executor.predict_batch(np.array([row]))
+            final_prediction = float(predictions[0])
+        if cache_key is not None:
+            prediction_cache.put(cache_key, (final_prediction, model_version), version=model_version)
+        # Queueing in the batcher and the executor hop, plus the scale/predict stages
+        STAGE_LATENCY.observe(time.perf_counter() - looked_up, "predict", "inference")
+
+    logged = time.perf_counter()
+    prediction_logger.info("Prediction made", extra={"fields": {
+        "prediction": final_prediction, "model_version": model_version, "input": log_input
+    }})
+    STAGE_LATENCY.observe(time.perf_counter() - logged, "predict", "log")
+    return final_prediction, model_version
+
+def parse_feature_body(body):
+    """Feature row from a JSON body, validated by FeatureInput only when the fast path fails.
+
+    The fast path reads the floats straight out of orjson's dict. Anything it
+    cannot handle is parsed with FeatureInput so clients get the same 422
+    errors as from the documented route.
+    """
+    try:
+        payload = orjson.loads(body)
+        return [float(payload[feature]) for feature in Config.FEATURE_COLUMNS], payload
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        payload = json.loads(body)
+    except ValueError as e:
+        raise RequestValidationError([ErrorWrapper(e, ("body", getattr(e, "pos", 0)))], body=body)
+    try:
+        features = FeatureInput.parse_obj(payload)
+    except ValidationError as e:
+        raise RequestValidationError([ErrorWrapper(e, ("body",))], body=payload)
+    return [getattr(features, feature) for feature in Config.FEATURE_COLUMNS], features
+
+async def predict_fast(request: Request):
+    """/predict without pydantic model construction or FastAPI's response encoder"""
+    body = await request.body()
+    row, log_input = parse_feature_body(body)
+    started = time.perf_counter()
+    parse_time = parse_seconds(request, started)
+    if parse_time is not None:
+        STAGE_LATENCY.observe(parse_time, "predict", "parse")
+    try:
+        final_prediction, model_version = await predict_single(row, started, log_input)
+        return Response(
+            content=orjson.dumps({"prediction": final_prediction, "model_version": model_version}),
+            media_type="application/json"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error making prediction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Routes match in registration order, so the fast path shadows the documented
+# /predict below, which stays in the OpenAPI schema (and serves when disabled)
+if Config.FAST_PARSE and orjson is not None:
+    app.add_api_route("/predict", predict_fast, methods=["POST"], include_in_schema=False)
+elif Config.FAST_PARSE:
+    logger.warning("FAST_PARSE is enabled but orjson is not installed; using the pydantic /predict")
+
 @app.post("/predict")
-async def predict(features: FeatureInput):
+async def predict(features: FeatureInput, request: Request):
+    started = time.perf_counter()
+    parse_time = parse_seconds(request, started)
+    if parse_time is not None:
+        STAGE_LATENCY.observe(parse_time, "predict", "parse")
     try:
-        # Validate input features
-        for feature, value in features.dict().items():
-            if not Config.is_valid_feature_value(feature, value):
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid value for {feature}: {value}. Expected between {Config.get_feature_range(feature)['min']} and {Config.get_feature_range(feature)['max']}."
-                )
-        
-        # Prepare input for prediction
-        feature_dict = features.dict()
-        input_df = pd.DataFrame([feature_dict])[Config.FEATURE_COLUMNS]
-        
-        # Scale the features
-        input_scaled = scaler.transform(input_df)
-        
-        # Make prediction
-        prediction = model.predict(input_scaled)
-        final_prediction = float(np.exp(prediction[0]))  # Ensure prediction is in the correct format
-        
-        logger.info(f"Prediction made for input: {feature_dict}")
-        return {"prediction": final_prediction}
+        row = [getattr(features, feature) for feature in Config.FEATURE_COLUMNS]
+        final_prediction, model_version = await predict_single(row, started, features)
+        return {"prediction": final_prediction, "model_version": model_version}
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error making prediction: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def build_feature_matrix(payload):
+    """Build a (n_rows, n_features) matrix in Config.FEATURE_COLUMNS order"""
+    if isinstance(payload, ColumnarFeatureInput):
+        return np.column_stack([
+            np.asarray(getattr(payload, feature), dtype=np.float64)
+            for feature in Config.FEATURE_COLUMNS
+        ])
+    return np.array(
+        [[getattr(row, feature) for feature in Config.FEATURE_COLUMNS] for row in payload],
+        dtype=np.float64
+    ).reshape(-1, len(Config.FEATURE_COLUMNS))
+
+def csv_chunk_matrix(chunk, strict=False):
+    """Feature matrix of a CSV chunk; non-numeric cells raise with ``strict`` and become NaN otherwise"""
+    features = chunk[Config.FEATURE_COLUMNS]
+    if strict:
+        return features.to_numpy(dtype=np.float64)
+    import pandas as pd
+    return features.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+
+async def predict_csv_chunks(spool, reader, first_chunk, first_X, policy):
+    """Yield the uploaded CSV chunk by chunk with a "Predicted Price" column appended.
+
+    Later chunks cannot fail the response any more, so their unparseable
+    cells become NaN and are handled by the invalid row policy like any
+    other out-of-range value.
+    """
+    try:
+        chunk, X, header = first_chunk, first_X, True
+        while chunk is not None:
+            validate_start = time.perf_counter()
+            X_valid, keep, _ = batch_validator.apply_policy(X, policy)
+            STAGE_LATENCY.observe(time.perf_counter() - validate_start, "predict_csv", "validate")
+            # Rows that are dropped are passed through with an empty prediction
+            predictions = np.full(len(X), np.nan)
+            if keep.any():
+                predictions[keep], _ = await executor.predict_batch(X_valid, endpoint="predict_csv")
+            chunk["Predicted Price"] = predictions
+            yield chunk.to_csv(index=False, header=header)
+            header = False
+
+            # Parsing the next chunk is blocking file IO, so keep it off the event loop
+            chunk = await run_in_threadpool(next, reader, None)
+            if chunk is not None:
+                X = csv_chunk_matrix(chunk)
+    except Exception as e:
+        # The status line has been sent; all that can be done is to log and end the stream
+        logger.error(f"Error streaming CSV predictions: {str(e)}")
+        raise
+    finally:
+        spool.close()
+
+@app.post("/predict_csv")
+async def predict_csv(
+    file: UploadFile = File(...),
+    invalid_rows: str = Query("drop", regex="^(drop|clip)$")
+):
+    """Stream predictions for an uploaded CSV back as CSV, one chunk at a time.
+
+    The header and the first chunk are parsed and type-checked before the
+    response starts, so a malformed file gets a 400. Streaming cannot reject
+    the whole file once output has started, so out-of-range rows are either
+    left without a prediction or clipped.
+    """
+    import pandas as pd
+
+    # Copy the upload to our own spool so it outlives the request's form cleanup
+    spool = tempfile.SpooledTemporaryFile(max_size=Config.CSV_SPOOL_MAX_BYTES)
+    try:
+        while True:
+            block = await file.read(1 << 20)
+            if not block:
+                break
+            spool.write(block)
+        spool.seek(0)
+
+        reader = pd.read_csv(spool, chunksize=Config.CSV_CHUNK_SIZE)
+        first_chunk = next(reader, None)
+        if first_chunk is None:
+            raise HTTPException(status_code=400, detail="Uploaded CSV is empty")
+        missing = [feature for feature in Config.FEATURE_COLUMNS if feature not in first_chunk.columns]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"CSV is missing columns: {', '.join(missing)}")
+        try:
+            first_X = csv_chunk_matrix(first_chunk, strict=True)
+        except (TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"CSV feature columns must be numeric: {str(e)}")
+    except HTTPException:
+        spool.close()
+        raise
+    except Exception as e:
+        spool.close()
+        logger.error(f"Error reading uploaded CSV: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Error reading CSV: {str(e)}")
+
+    logger.info("Streaming CSV predictions for %s", file.filename)
+    return StreamingResponse(
+        predict_csv_chunks(spool, reader, first_chunk, first_X, invalid_rows),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": "attachment; filename=predictions.csv",
+            "X-Model-Version": registry.version
+        }
+    )
+
+async def predict_validated(X, invalid_rows, endpoint):
+    """Apply the invalid row policy to a batch and predict it with one model call.
+
+    Returns ``(predictions, keep, model_version, report)`` where rows that were
+    not predicted are NaN. The ``reject`` policy raises a 400 with the report.
+    """
+    validate_start = time.perf_counter()
+    try:
+        X_valid, keep, report = batch_validator.apply_policy(X, invalid_rows)
+    except BatchValidationError as e:
+        raise HTTPException(status_code=400, detail={"message": "Invalid feature values", **e.report})
+    STAGE_LATENCY.observe(time.perf_counter() - validate_start, endpoint, "validate")
+
+    if len(X_valid) == 0:
+        return np.full(len(X), np.nan), keep, registry.version, report
+
+    # One scale + predict call for the whole batch
+    predictions, model_version = await executor.predict_batch(X_valid, endpoint=endpoint)
+    if report is not None:
+        predictions_all = np.full(len(X), np.nan)
+        predictions_all[keep] = predictions
+        predictions = predictions_all
+    return predictions, keep, model_version, report
+
+@app.post("/bulk_predict")
+async def bulk_predict(
+    payload: Union[ColumnarFeatureInput, List[FeatureInput]],
+    request: Request,
+    invalid_rows: str = Query(Config.BULK_INVALID_ROW_POLICY, regex=f"^({'|'.join(INVALID_ROW_POLICIES)})$")
+):
+    """Predict a whole batch (records or columnar) with a single model call.
+
+    ``invalid_rows`` picks what happens to out-of-range rows: ``reject`` the
+    batch, ``drop`` them (their prediction is null) or ``clip`` them.
+    """
+    started = time.perf_counter()
+    parse_time = parse_seconds(request, started)
+    if parse_time is not None:
+        STAGE_LATENCY.observe(parse_time, "bulk_predict", "parse")
+    try:
+        X = build_feature_matrix(payload)
+        STAGE_LATENCY.observe(time.perf_counter() - started, "bulk_predict", "build")
+        predictions, keep, model_version, report = await predict_validated(X, invalid_rows, "bulk_predict")
+
+        results = predictions.astype(float).tolist()
+        if report is not None:
+            results = [prediction if kept else None for prediction, kept in zip(results, keep.tolist())]
+
+        logger.info("Bulk prediction made", extra={"fields": {
+            "rows": len(X), "invalid_rows": report["invalid_rows"] if report else 0, "model_version": model_version
+        }})
+        return {"predictions": results, "model_version": model_version, "validation": report}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error making bulk prediction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/bulk_predict/binary")
+async def bulk_predict_binary(
+    request: Request,
+    invalid_rows: str = Query(Config.BULK_INVALID_ROW_POLICY, regex=f"^({'|'.join(INVALID_ROW_POLICIES)})$")
+):
+    """Bulk prediction with a binary body decoded straight into a NumPy matrix.
+
+    Content-Type selects the request format and Accept the response format
+    (defaulting to the request's): ``application/vnd.apache.arrow.stream``,
+    ``application/msgpack`` or ``application/x-float32-matrix`` (uint32 LE
+    header length, comma-separated column names, row-major float32 LE
+    values). Rows without a prediction are null (Arrow) or NaN. The model
+    version and validation report are returned in ``X-Model-Version`` and
+    ``X-Validation-Report`` headers.
+    """
+    started = time.perf_counter()
+    parse_time = parse_seconds(request, started)
+    if parse_time is not None:
+        STAGE_LATENCY.observe(parse_time, "bulk_predict_binary", "parse")
+    try:
+        content_type = request.headers.get("content-type")
+        try:
+            X = decode_matrix(await request.body(), content_type)
+        except UnsupportedMediaType as e:
+            raise HTTPException(status_code=415, detail=str(e))
+        except WireFormatError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            media_type = negotiate(request.headers.get("accept"), normalize_media_type(content_type))
+        except UnsupportedMediaType as e:
+            raise HTTPException(status_code=406, detail=str(e))
+        decoded = time.perf_counter()
+        STAGE_LATENCY.observe(decoded - started, "bulk_predict_binary", "decode")
+
+        predictions, _, model_version, report = await predict_validated(X, invalid_rows, "bulk_predict_binary")
+
+        encode_start = time.perf_counter()
+        try:
+            body = encode_predictions(predictions, media_type, model_version)
+        except UnsupportedMediaType as e:
+            raise HTTPException(status_code=406, detail=str(e))
+        STAGE_LATENCY.observe(time.perf_counter() - encode_start, "bulk_predict_binary", "encode")
+
+        logger.info("Binary bulk prediction made", extra={"fields": {
+            "rows": len(X), "format": media_type, "invalid_rows": report["invalid_rows"] if report else 0,
+            "model_version": model_version
+        }})
+        headers = {"X-Model-Version": model_version}
+        if report is not None:
+            headers["X-Validation-Report"] = report_header(report)
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error making binary bulk prediction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/sensitivity")
+async def sensitivity(payload: SensitivityInput):
+    """Price curve (one axis) or grid (two axes) around a base vector from one model call.
+
+    ``predictions`` has one nesting level per axis, indexed like ``grid``.
+    """
+    try:
+        # Check the size before building any grid, so an oversized request allocates nothing
+        n_points = math.prod(axis.size for axis in payload.axes)
+        if n_points > Config.SENSITIVITY_MAX_POINTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Grid has {n_points} points, the limit is {Config.SENSITIVITY_MAX_POINTS}"
+            )
+        grids = [axis.grid() for axis in payload.axes]
+
+        base = [getattr(payload.base, feature) for feature in Config.FEATURE_COLUMNS]
+        X = np.tile(np.asarray(base, dtype=np.float64), (n_points, 1))
+        mesh = np.meshgrid(*grids, indexing="ij")
+        for axis, values in zip(payload.axes, mesh):
+            X[:, Config.FEATURE_COLUMNS.index(axis.feature)] = values.ravel()
+
+        try:
+            X_valid, _, _ = batch_validator.apply_policy(X, "reject")
+        except BatchValidationError as e:
+            raise HTTPException(status_code=400, detail={"message": "Sweep leaves the valid feature range", **e.report})
+
+        predictions, model_version = await executor.predict_batch(X_valid, endpoint="sensitivity")
+        return {
+            "features": [axis.feature for axis in payload.axes],
+            "grid": [grid.tolist() for grid in grids],
+            "predictions": predictions.reshape([len(grid) for grid in grids]).astype(float).tolist(),
+            "model_version": model_version
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error computing sensitivity: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/batcher/stats")
+async def batcher_stats():
+    """Batch size distribution of the /predict micro-batcher"""
+    return batcher.stats()
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss/eviction counters of the prediction cache"""
+    return prediction_cache.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request, stage latency and batch size metrics in Prometheus text format"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/model")
+async def model_info():
+    """Version and provenance of the model currently being served"""
+    return registry.info()
+
+last_forced_reload = None
+
+def check_admin(request):
+    """Require Config.ADMIN_TOKEN in X-Admin-Token, or a loopback client when no token is set"""
+    if Config.ADMIN_TOKEN:
+        token = request.headers.get("X-Admin-Token", "")
+        if not hmac.compare_digest(token.encode(), Config.ADMIN_TOKEN.encode()):
+            raise HTTPException(status_code=401, detail="Invalid or missing admin token")
+        return
+    try:
+        loopback = request.client is not None and ipaddress.ip_address(request.client.host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise HTTPException(status_code=403, detail="Admin endpoints are only served to localhost unless API_ADMIN_TOKEN is set")
+
+@app.post("/admin/reload")
+async def admin_reload(request: Request, force: bool = False):
+    """Load the artifacts on disk and swap them in without dropping requests"""
+    global last_forced_reload
+    check_admin(request)
+    if force:
+        # A forced reload revalidates the model on the holdout even when nothing changed
+        now = time.monotonic()
+        if last_forced_reload is not None and now - last_forced_reload < Config.ADMIN_FORCED_RELOAD_INTERVAL:
+            retry_after = Config.ADMIN_FORCED_RELOAD_INTERVAL - (now - last_forced_reload)
+            raise HTTPException(status_code=429, detail="Forced reloads are rate limited",
+                                headers={"Retry-After": str(int(retry_after) + 1)})
+        last_forced_reload = now
+    previous_version = registry.version
+    try:
+        changed = await reload_model(force)
+    except ModelValidationError as e:
+        logger.error(f"Rejected new model: {str(e)}")
+        raise HTTPException(status_code=409, detail=f"New model rejected: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error reloading model: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error reloading model: {str(e)}")
+    return {"reloaded": changed, "previous_version": previous_version, "model_version": registry.version}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host=Config.HOST, port=Config.PORT)
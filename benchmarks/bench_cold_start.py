@@ -0,0 +1,60 @@
+"""Cold-start time of the API's model loading paths, each in a fresh interpreter.
+
+Compares the pickled sklearn pipeline with the native artifacts written by
+src.export (xgboost booster file, and the NumPy-only compiled forest), timing
+imports + artifact loading + the first prediction.
+
+Usage: python -m benchmarks.bench_cold_start [--runs 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import numpy as np
+from config.config import Config
+
+PATHS = {
+    "pickle": "from src.inference import load_engine as load; engine = load(backend='xgboost')",
+    "native-xgboost": "from src.inference import load_native_engine as load; engine = load(backend='xgboost')",
+    "native-compiled": "from src.inference import load_native_engine as load; engine = load(backend='compiled')",
+}
+
+SCRIPT = """
+import time
+start = time.perf_counter()
+{load}
+loaded = time.perf_counter()
+engine.predict_batch(engine.mean[None, :])
+first = time.perf_counter()
+import json, sys
+print(json.dumps({{
+    "load_s": loaded - start,
+    "first_prediction_s": first - start,
+    "modules": [m for m in ("sklearn", "pandas", "xgboost") if m in sys.modules]
+}}))
+"""
+
+
+def run_once(load):
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", SCRIPT.format(load=load)],
+        cwd=Config.BASE_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'path':<18}{'load s':>9}{'first pred s':>14}  imported")
+    for name, load in PATHS.items():
+        runs = [run_once(load) for _ in range(args.runs)]
+        load_s = np.median([r["load_s"] for r in runs])
+        first_s = np.median([r["first_prediction_s"] for r in runs])
+        print(f"{name:<18}{load_s:>9.3f}{first_s:>14.3f}  {', '.join(runs[0]['modules']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Load time and memory of the CSV vs the columnar dataset cache at several dataset sizes.
+
+For each scale the dataset is repeated ``scale`` times into a temporary CSV.
+Every loader runs in a fresh process, reads the data and touches every
+loaded value (column sums); memory is the growth of the process's resident
+anonymous (private) and file-backed (page cache, shareable) memory.
+Loaders: full CSV parse, CSV with usecols projection, cache build (first
+load), cached load of all columns and of the model columns, memory-mapped
+and copied.
+
+Usage: python -m benchmarks.bench_dataset [--scales 1 1000] [--repeat 3]
+"""
+import argparse
+import multiprocessing
+import shutil
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+from config.config import Config
+
+LOADERS = ("csv", "csv_projected", "cache_build", "cache_all", "cache_projected", "cache_projected_copy")
+
+
+def _rss_mb():
+    # (RssAnon, RssFile) of this process in MB; Linux only
+    fields = dict(line.split(":", 1) for line in Path("/proc/self/status").read_text().splitlines())
+    return tuple(int(fields[name].split()[0]) / 1024 for name in ("RssAnon", "RssFile"))
+
+
+def _measure(loader, source, cache_dir, queue):
+    Config.DATASET_CACHE_DIR = cache_dir
+    from src.dataset import build_cache, load_dataset, model_columns
+
+    baseline = _rss_mb()
+    start = time.perf_counter()
+    if loader == "csv":
+        df = pd.read_csv(source)
+    elif loader == "csv_projected":
+        df = pd.read_csv(source, usecols=model_columns())
+    elif loader == "cache_build":
+        build_cache(source)
+        df = load_dataset(source=source)
+    elif loader == "cache_all":
+        df = load_dataset(source=source)
+    elif loader == "cache_projected":
+        df = load_dataset(model_columns(), source=source)
+    else:
+        df = load_dataset(model_columns(), source=source, mmap=False)
+    df.sum()
+    seconds = time.perf_counter() - start
+    anon, file = (after - before for after, before in zip(_rss_mb(), baseline))
+    queue.put((seconds, anon, file))
+
+
+def run(loader, source, cache_dir):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(loader, source, cache_dir, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 1000])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per loader; the fastest is reported")
+    args = parser.parse_args()
+
+    base = pd.read_csv(Config.DATA_PATH)
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        print(f"{'scale':>6}{'rows':>10}{'loader':>22}{'ms':>10}{'anon MB':>9}{'file MB':>9}")
+        for scale in args.scales:
+            source = workdir / f"boston_x{scale}.csv"
+            pd.concat([base] * scale, ignore_index=True).to_csv(source, index=False)
+            cache_dir = workdir / f"cache_x{scale}"
+            for loader in LOADERS:
+                runs = [run(loader, source, cache_dir) for _ in range(1 if loader == "cache_build" else args.repeat)]
+                seconds, anon, file = min(runs)
+                print(f"{scale:>6}{len(base) * scale:>10}{loader:>22}{seconds * 1000:>10.1f}{anon:>9.1f}{file:>9.1f}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
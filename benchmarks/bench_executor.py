@@ -0,0 +1,56 @@
+"""Throughput of the inline, thread and process inference executors.
+
+Fires concurrent batches at InferenceExecutor.predict_batch for each mode and
+reports rows/s, so the pool size and mode in Config can be chosen per machine.
+
+Usage: python -m benchmarks.bench_executor [--workers N] [--requests N] [--batch-sizes 1 64 1024]
+"""
+import argparse
+import asyncio
+import time
+import numpy as np
+from config.config import Config
+from src.executor import EXECUTOR_MODES, InferenceExecutor
+from src.model_registry import ModelRegistry
+
+
+async def run_mode(registry, mode, workers, batch_size, requests, concurrency):
+    executor = InferenceExecutor(registry, mode=mode, workers=workers)
+    engine = registry.engine
+    await executor.warmup()
+    rng = np.random.default_rng(Config.RANDOM_STATE)
+    X = engine.mean + rng.standard_normal((batch_size, engine.n_features)) * engine.scale
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await executor.predict_batch(X)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(requests)])
+    elapsed = time.perf_counter() - start
+    executor.shutdown()
+    return requests / elapsed, requests * batch_size / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=Config.INFERENCE_WORKERS)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 1024])
+    args = parser.parse_args()
+
+    registry = ModelRegistry()
+    registry.reload()
+    print(f"workers={args.workers} concurrency={args.concurrency} requests={args.requests}")
+    print(f"{'mode':<10}{'batch':>8}{'calls/s':>12}{'rows/s':>14}")
+    for batch_size in args.batch_sizes:
+        for mode in EXECUTOR_MODES:
+            calls, rows = asyncio.run(run_mode(registry, mode, args.workers, batch_size,
+                                               args.requests, args.concurrency))
+            print(f"{mode:<10}{batch_size:>8}{calls:>12.0f}{rows:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Search wall-time for different splits of the cores between CV fits and booster threads.
+
+Runs the same budgeted random search (identical candidates and folds) with
+each outer x inner split, including the previous behaviour where every
+concurrent fit also starts one xgboost thread per core (oversubscribed).
+
+Usage: python -m benchmarks.bench_parallelism [--max-fits 150] [--splits 1x8 8x1 4x2]
+"""
+import argparse
+from src.data_preparation import load_and_prepare_data
+from src.model import create_pipeline
+from src.parallelism import available_cores, plan_parallelism
+from src.search import SearchBudget, run_search
+
+
+def default_splits(cores):
+    splits = {(1, cores), (cores, 1), (cores, cores)}
+    if cores >= 4:
+        splits.add((cores // 2, 2))
+        splits.add((2, cores // 2))
+    return sorted(splits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-fits", type=int, default=150)
+    parser.add_argument("--strategy", default="random")
+    parser.add_argument("--splits", nargs="+", default=None, help="OUTERxINNER pairs, e.g. 4x2")
+    args = parser.parse_args()
+
+    cores = available_cores()
+    splits = ([tuple(int(n) for n in split.split("x")) for split in args.splits]
+              if args.splits else default_splits(cores))
+    auto = plan_parallelism(args.max_fits)
+    X_train, _, y_train, _, _ = load_and_prepare_data(save_scaler=False)
+    pipeline = create_pipeline()
+
+    print(f"cores={cores} strategy={args.strategy} fits={args.max_fits}")
+    print(f"{'outer x inner':<16}{'threads':>8}{'seconds':>9}{'fits/s':>8}{'cv r2':>8}")
+    runs = [(f"{outer}x{inner}", outer, inner) for outer, inner in splits]
+    runs.append((f"auto ({auto.outer_jobs}x{auto.inner_threads})", None, None))
+    for label, outer, inner in runs:
+        result = run_search(pipeline, X_train, y_train, strategy=args.strategy,
+                            budget=SearchBudget(max_fits=args.max_fits), outer_jobs=outer, inner_threads=inner)
+        threads = (outer or auto.outer_jobs) * (inner or auto.inner_threads)
+        print(f"{label:<16}{threads:>8}{result.seconds:>9.1f}{result.n_fits / result.seconds:>8.1f}"
+              f"{result.best_score:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Per-request latency of the /predict inference path: pandas + sklearn vs InferenceEngine.
+
+``engine`` is the inline serving path (range check plus
+``InferenceEngine.predict_values``); ``served`` awaits the /predict handler's
+``predict_single`` as configured (micro-batcher or executor), with the
+prediction cache off so every call reaches the model. HTTP and JSON parsing
+are not included in any path.
+
+Usage: python -m benchmarks.bench_predict_latency [--iterations N]
+"""
+import argparse
+import asyncio
+import pickle
+import time
+import numpy as np
+import pandas as pd
+from config.config import Config
+import app
+
+# The legacy path reads the pickled pipeline and scaler, as /predict originally did
+with open(Config.MODEL_PATH, 'rb') as f:
+    MODEL = pickle.load(f)
+with open(Config.SCALER_PATH, 'rb') as f:
+    SCALER = pickle.load(f)
+
+SAMPLE = {
+    "LSTAT": 10.0, "RM": 6.0, "CRIM": 0.1, "PTRATIO": 15.0,
+    "INDUS": 10.0, "TAX": 300.0, "NOX": 0.5, "B": 300.0
+}
+
+
+def legacy_predict(features):
+    """The original /predict body: dict -> DataFrame -> scaler -> pipeline"""
+    for feature, value in features.dict().items():
+        Config.is_valid_feature_value(feature, value)
+    input_df = pd.DataFrame([features.dict()])[Config.FEATURE_COLUMNS]
+    input_scaled = SCALER.transform(input_df)
+    return float(np.exp(MODEL.predict(input_scaled)[0]))
+
+
+def engine_predict(features):
+    """The inline /predict path: row in feature order -> range check -> preallocated row -> booster"""
+    row = [getattr(features, feature) for feature in Config.FEATURE_COLUMNS]
+    if app.batch_validator.first_violation(row) is not None:
+        raise ValueError(f"Out-of-range sample {row}")
+    return app.registry.engine.predict_values(row)
+
+
+def time_calls(fn, features, iterations, warmup=50):
+    for _ in range(warmup):
+        fn(features)
+    timings = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(features)
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+
+async def time_served(features, iterations, warmup=50):
+    """Timings of the /predict handler's predict_single, with the app's startup and shutdown around them"""
+    row = [getattr(features, feature) for feature in Config.FEATURE_COLUMNS]
+    await app.start_inference()
+    try:
+        for _ in range(warmup):
+            await app.predict_single(row, time.perf_counter(), None)
+        timings = np.empty(iterations)
+        for i in range(iterations):
+            start = time.perf_counter()
+            await app.predict_single(row, start, None)
+            timings[i] = time.perf_counter() - start
+    finally:
+        await app.stop_inference()
+    return timings * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    Config.PREDICTION_CACHE_ENABLED = False
+    Config.MODEL_WATCH_INTERVAL = 0
+
+    features = app.FeatureInput(**SAMPLE)
+    legacy, fast = legacy_predict(features), engine_predict(features)
+    assert np.isclose(legacy, fast, rtol=1e-6), (legacy, fast)
+
+    print(f"executor={Config.INFERENCE_EXECUTOR} batching={Config.BATCHING_ENABLED} backend={Config.INFERENCE_BACKEND}")
+    print(f"{'path':<10}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}")
+    results = {
+        "legacy": time_calls(legacy_predict, features, args.iterations),
+        "engine": time_calls(engine_predict, features, args.iterations),
+        "served": asyncio.run(time_served(features, args.iterations)),
+    }
+    for name, timings in results.items():
+        print(f"{name:<10}{timings.mean():>10.1f}{np.percentile(timings, 50):>10.1f}{np.percentile(timings, 99):>10.1f}")
+    print(f"speedup: engine {results['legacy'].mean() / results['engine'].mean():.1f}x, "
+          f"served {results['legacy'].mean() / results['served'].mean():.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Best CV score per unit of compute for each hyperparameter search strategy.
+
+Runs the exhaustive grid (the original 128-combination training grid, no
+budget) and the budgeted random, successive-halving and TPE searches over
+Config.PARAMS on the training split, then refits each winner and scores it
+on the test split. ``--early-stopping on off`` compares the early-stopping
+CV mode (n_estimators chosen per candidate) with the full-refit mode.
+Artifacts are not modified.
+
+Usage: python -m benchmarks.bench_search [--max-fits 300] [--max-seconds S] [--strategies halving tpe] [--early-stopping on off]
+"""
+import argparse
+import json
+import time
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+from src.data_preparation import load_and_prepare_data
+from src.model import create_pipeline
+from src.search import SEARCH_STRATEGIES, SearchBudget, run_search
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strategies", nargs="+", choices=SEARCH_STRATEGIES, default=list(SEARCH_STRATEGIES))
+    parser.add_argument("--max-fits", type=int, default=300, help="fit budget of the sampling strategies")
+    parser.add_argument("--max-seconds", type=float, default=None)
+    parser.add_argument("--grid-budget", action="store_true", help="apply the budget to the grid too")
+    parser.add_argument("--early-stopping", nargs="+", choices=("on", "off"), default=None,
+                        help="CV modes to run (default: Config.EARLY_STOPPING)")
+    parser.add_argument("--output", default=None, help="write the full reports as JSON")
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test, _ = load_and_prepare_data(save_scaler=False)
+    pipeline = create_pipeline()
+
+    modes = [mode == "on" for mode in args.early_stopping] if args.early_stopping else [None]
+
+    reports = []
+    print(f"{'strategy':<10}{'es':>4}{'fits':>7}{'seconds':>9}{'cv r2':>9}{'test r2':>9}{'cv r2/min':>11}{'trees':>7}")
+    for strategy in args.strategies:
+        for early_stopping in modes:
+            unbudgeted = strategy == "grid" and not args.grid_budget
+            budget = SearchBudget() if unbudgeted else SearchBudget(args.max_fits, args.max_seconds)
+            result = run_search(pipeline, X_train, y_train, strategy=strategy, budget=budget,
+                                early_stopping=early_stopping)
+            refit_start = time.perf_counter()
+            model = clone(pipeline).set_params(**result.best_params).fit(X_train, y_train)
+            test_r2 = r2_score(y_test, model.predict(X_test))
+            n_trees = model.named_steps['regressor'].get_booster().num_boosted_rounds()
+            report = result.report()
+            report.update(test_r2=test_r2, refit_seconds=time.perf_counter() - refit_start,
+                          early_stopping=early_stopping, n_trees=n_trees)
+            reports.append(report)
+            mode = "-" if early_stopping is None else ("on" if early_stopping else "off")
+            print(f"{strategy:<10}{mode:>4}{result.n_fits:>7}{result.seconds:>9.1f}{result.best_score:>9.4f}"
+                  f"{test_r2:>9.4f}{result.best_score / (result.seconds / 60):>11.3f}{n_trees:>7}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Search wall-time of the sklearn-wrapper backend vs the native prebuilt-matrix backend.
+
+Runs the same search (default: the exhaustive Config.PARAM_GRID, unbudgeted)
+with each backend and checks both reach the same best candidate and score,
+since the two backends train identical boosters on identical folds.
+
+Usage: python -m benchmarks.bench_search_backend [--strategy grid] [--max-fits N] [--early-stopping] [--repeat 1]
+"""
+import argparse
+from src.data_preparation import load_and_prepare_data
+from src.model import create_pipeline
+from src.search import SEARCH_BACKENDS, SEARCH_STRATEGIES, SearchBudget, run_search
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strategy", choices=SEARCH_STRATEGIES, default="grid")
+    parser.add_argument("--max-fits", type=int, default=None, help="fit budget (default: none)")
+    parser.add_argument("--early-stopping", action="store_true")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per backend; the fastest is reported")
+    args = parser.parse_args()
+
+    X_train, _, y_train, _, _ = load_and_prepare_data(save_scaler=False)
+    pipeline = create_pipeline()
+
+    print(f"{'backend':<10}{'fits':>7}{'seconds':>9}{'fits/s':>8}{'cv r2':>9}")
+    results = {}
+    for backend in SEARCH_BACKENDS:
+        runs = [run_search(pipeline, X_train, y_train, strategy=args.strategy, budget=SearchBudget(args.max_fits),
+                           early_stopping=args.early_stopping, backend=backend)
+                for _ in range(args.repeat)]
+        result = min(runs, key=lambda run: run.seconds)
+        results[backend] = result
+        print(f"{backend:<10}{result.n_fits:>7}{result.seconds:>9.1f}{result.n_fits / result.seconds:>8.1f}"
+              f"{result.best_score:>9.4f}")
+
+    sklearn, native = results["sklearn"], results["native"]
+    print(f"speedup {sklearn.seconds / native.seconds:.2f}x, "
+          f"same best candidate: {sklearn.best_params == native.best_params}, "
+          f"score difference: {abs(sklearn.best_score - native.best_score):.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Latency and throughput of the compiled tree ensemble vs the native booster.
+
+Checks that CompiledForest matches the booster's margins (max_abs_error),
+then times both predictors on batches from 1 to 1M rows.
+
+Usage: python -m benchmarks.bench_tree_compiler [--max-rows 1000000] [--repeats 5]
+"""
+import argparse
+import pickle
+import time
+import numpy as np
+from config.config import Config
+from src.inference import extract_booster
+from src.tree_compiler import compile_booster, max_abs_error
+
+
+def best_time(fn, X, repeats):
+    fn(X)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(Config.MODEL_PATH, 'rb') as f:
+        model = pickle.load(f)
+    booster = extract_booster(model)
+    start = time.perf_counter()
+    forest = compile_booster(booster)
+    print(f"compiled {forest.n_trees} trees / {forest.n_nodes} nodes in {time.perf_counter() - start:.3f}s")
+
+    rng = np.random.default_rng(Config.RANDOM_STATE)
+    X_all = rng.standard_normal((args.max_rows, len(Config.FEATURE_COLUMNS)))
+
+    error = max_abs_error(forest, booster, X_all[:100_000])
+    print(f"max |compiled - booster| on 100k rows: {error:.2e}")
+    assert error < 1e-4
+
+    print(f"{'rows':>9}{'xgboost ms':>12}{'compiled ms':>13}{'xgboost rows/s':>16}{'compiled rows/s':>17}")
+    n_rows = 1
+    while n_rows <= args.max_rows:
+        X = X_all[:n_rows]
+        native = best_time(booster.inplace_predict, X, args.repeats)
+        compiled = best_time(forest.predict_margin, X, args.repeats)
+        print(f"{n_rows:>9}{native * 1e3:>12.3f}{compiled * 1e3:>13.3f}"
+              f"{n_rows / native:>16.0f}{n_rows / compiled:>17.0f}")
+        n_rows *= 10
+
+
+if __name__ == "__main__":
+    main()
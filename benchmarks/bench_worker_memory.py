@@ -0,0 +1,78 @@
+"""Resident memory per API worker for each model loading path.
+
+Starts N worker-like interpreters per path, each loading the model and making
+one prediction, and reads RSS and PSS (proportional set size: shared pages are
+divided between the processes mapping them) from /proc/<pid>/smaps_rollup
+while all of them are alive. PSS is the per-worker cost that sharing reduces.
+Linux only.
+
+Usage: python -m benchmarks.bench_worker_memory [--workers 4]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from config.config import Config
+
+PATHS = {
+    "pickle": "from src.inference import load_engine as load; engine = load(backend='xgboost')",
+    "native-xgboost": "from src.inference import load_native_engine as load; engine = load(backend='xgboost')",
+    "native-compiled": ("from config.config import Config; Config.FOREST_MMAP = False\n"
+                        "from src.inference import load_native_engine as load; engine = load(backend='compiled')"),
+    "native-compiled-mmap": ("from config.config import Config; Config.FOREST_MMAP = True\n"
+                             "from src.inference import load_native_engine as load; engine = load(backend='compiled')"),
+}
+
+SCRIPT = """
+{load}
+engine.predict_batch(engine.mean[None, :])
+import sys
+print("ready", flush=True)
+sys.stdin.read()
+"""
+
+
+def memory_kb(pid):
+    """Rss and Pss in kB from smaps_rollup"""
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        key, _, rest = line.partition(":")
+        if key in ("Rss", "Pss"):
+            values[key] = int(rest.split()[0])
+    return values
+
+
+def measure(load, workers):
+    processes = [
+        subprocess.Popen([sys.executable, "-W", "ignore", "-c", SCRIPT.format(load=load)],
+                         cwd=Config.BASE_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                         stderr=subprocess.DEVNULL, text=True)
+        for _ in range(workers)
+    ]
+    try:
+        for process in processes:
+            if process.stdout.readline().strip() != "ready":
+                raise RuntimeError(f"Worker exited with code {process.wait()}")
+        return [memory_kb(process.pid) for process in processes]
+    finally:
+        for process in processes:
+            process.stdin.close()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"workers={args.workers}")
+    print(f"{'path':<22}{'RSS MB/worker':>15}{'PSS MB/worker':>15}{'PSS MB total':>14}")
+    for name, load in PATHS.items():
+        stats = measure(load, args.workers)
+        rss = sum(s["Rss"] for s in stats) / len(stats) / 1024
+        pss = sum(s["Pss"] for s in stats) / 1024
+        print(f"{name:<22}{rss:>15.1f}{pss / len(stats):>15.1f}{pss:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
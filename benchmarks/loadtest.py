@@ -0,0 +1,287 @@
+"""Load test of the prediction API with single-row, concurrent and bulk workloads.
+
+Drives the app either in-process through an ASGI transport (no network, no
+server) or through a uvicorn server launched locally, records throughput and
+p50/p95/p99 latency per workload, writes the results as JSON and optionally
+compares them with a stored baseline, exiting non-zero on regressions.
+
+Each workload (and each warm-up) sends its own rows, and the prediction
+cache is off unless ``--cache on``, so single and concurrent latencies
+measure inference rather than cache hits. The cache setting is recorded in
+the results.
+
+Usage:
+  python -m benchmarks.loadtest --target asgi --save-baseline
+  python -m benchmarks.loadtest --target uvicorn --baseline benchmarks/baselines/loadtest_uvicorn.json
+  python -m benchmarks.loadtest --target asgi --workloads single bulk --max-latency-regression 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+import httpx
+import numpy as np
+from config.config import Config
+
+WORKLOADS = ("single", "concurrent", "bulk")
+TARGETS = ("asgi", "uvicorn")
+RESULTS_DIR = Path(__file__).parent / "results"
+BASELINES_DIR = Path(__file__).parent / "baselines"
+
+# Metrics compared against the baseline: latency may not grow, throughput may not shrink
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+THROUGHPUT_METRICS = ("requests_per_s",)
+
+
+def make_rows(n_rows, seed=Config.RANDOM_STATE):
+    """Deterministic feature rows inside the validated ranges, as JSON records"""
+    rng = np.random.default_rng(seed)
+    mins, maxs = (np.array(bounds, dtype=np.float64) for bounds in Config.get_feature_bounds())
+    X = mins + rng.random((n_rows, len(mins))) * (maxs - mins)
+    return [dict(zip(Config.FEATURE_COLUMNS, row)) for row in np.round(X, 4).tolist()]
+
+
+def summarize(latencies, errors, elapsed, rows_per_request):
+    """Throughput and latency percentiles for one workload"""
+    latencies_ms = np.asarray(latencies) * 1000.0
+    requests = len(latencies)
+    summary = {
+        "requests": requests,
+        "errors": errors,
+        "duration_s": elapsed,
+        "requests_per_s": requests / elapsed if elapsed else 0.0,
+        "rows_per_s": requests * rows_per_request / elapsed if elapsed else 0.0,
+    }
+    if requests:
+        p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+        summary.update(mean_ms=float(latencies_ms.mean()), p50_ms=float(p50), p95_ms=float(p95),
+                       p99_ms=float(p99), max_ms=float(latencies_ms.max()))
+    return summary
+
+
+async def run_workload(client, path, payloads, concurrency, rows_per_request):
+    """POST every payload with at most ``concurrency`` requests in flight"""
+    latencies, errors = [], 0
+    queue = iter(payloads)
+
+    async def worker():
+        nonlocal errors
+        for payload in queue:
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=payload)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return summarize(latencies, errors, time.perf_counter() - start, rows_per_request)
+
+
+async def run_suite(client, args):
+    # Disjoint rows per workload and for the warm-ups, so no workload replays another's requests
+    per_row_workload = args.warmup + args.requests
+    rows = make_rows(2 * per_row_workload + args.bulk_rows * (args.bulk_requests + 1))
+    single, concurrent, bulk = rows[:per_row_workload], rows[per_row_workload:2 * per_row_workload], \
+        rows[2 * per_row_workload:]
+    bulk_payloads = [bulk[i * args.bulk_rows:(i + 1) * args.bulk_rows] for i in range(args.bulk_requests + 1)]
+    plans = {
+        "single": ("/predict", single, 1, 1, args.warmup),
+        "concurrent": ("/predict", concurrent, args.concurrency, 1, args.warmup),
+        "bulk": ("/bulk_predict", bulk_payloads, min(args.concurrency, args.bulk_requests), args.bulk_rows, 1),
+    }
+    results = {}
+    for name in args.workloads:
+        path, payloads, concurrency, rows_per_request, warmup = plans[name]
+        # Warm-up requests are not measured
+        await run_workload(client, path, payloads[:warmup], concurrency, rows_per_request)
+        results[name] = await run_workload(client, path, payloads[warmup:], concurrency, rows_per_request)
+        results[name]["concurrency"] = concurrency
+        results[name]["rows_per_request"] = rows_per_request
+        print(format_row(name, results[name]))
+    return results
+
+
+async def run_asgi(args):
+    """In-process run through httpx's ASGI transport (startup/shutdown run explicitly)"""
+    from app import app
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            return await run_suite(client, args)
+    finally:
+        await app.router.shutdown()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(base_url, process, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode} during start-up")
+        try:
+            if httpx.get(f"{base_url}/model", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"API at {base_url} was not ready after {timeout}s")
+
+
+def run_uvicorn(args):
+    """Run against a uvicorn server started in a subprocess for the duration of the test"""
+    port = args.port or free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1",
+               "--port", str(port), "--log-level", "warning"]
+    env = dict(os.environ, PREDICTION_CACHE="1" if Config.PREDICTION_CACHE_ENABLED else "0")
+    process = subprocess.Popen(command, cwd=Config.BASE_DIR, env=env)
+    try:
+        wait_until_ready(base_url, process, args.startup_timeout)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+        async def run():
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+                return await run_suite(client, args)
+
+        return asyncio.run(run())
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Config.BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, max_latency_regression, max_throughput_regression):
+    """List of human-readable regressions of ``results`` against ``baseline``"""
+    regressions = []
+    for workload, current in results.items():
+        previous = baseline.get("workloads", {}).get(workload)
+        if not previous:
+            continue
+        for metric in LATENCY_METRICS:
+            if metric in current and previous.get(metric):
+                change = current[metric] / previous[metric] - 1.0
+                if change > max_latency_regression:
+                    regressions.append(f"{workload} {metric}: {previous[metric]:.2f} -> "
+                                       f"{current[metric]:.2f} ({change:+.0%})")
+        for metric in THROUGHPUT_METRICS:
+            if previous.get(metric):
+                change = current[metric] / previous[metric] - 1.0
+                if -change > max_throughput_regression:
+                    regressions.append(f"{workload} {metric}: {previous[metric]:.1f} -> "
+                                       f"{current[metric]:.1f} ({change:+.0%})")
+        if current["errors"] > previous.get("errors", 0):
+            regressions.append(f"{workload} errors: {previous.get('errors', 0)} -> {current['errors']}")
+    return regressions
+
+
+def format_row(name, summary):
+    return (f"{name:<12}{summary['requests_per_s']:>10.1f}{summary['rows_per_s']:>12.1f}"
+            f"{summary.get('p50_ms', float('nan')):>9.2f}{summary.get('p95_ms', float('nan')):>9.2f}"
+            f"{summary.get('p99_ms', float('nan')):>9.2f}{summary['errors']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=TARGETS, default="asgi")
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--requests", type=int, default=1000, help="requests per single/concurrent workload")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--bulk-rows", type=int, default=1000, help="rows per /bulk_predict request")
+    parser.add_argument("--bulk-requests", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests before each workload")
+    parser.add_argument("--cache", choices=("on", "off"), default="off",
+                        help="prediction cache of the API under test (off: every request runs inference)")
+    parser.add_argument("--port", type=int, default=None, help="uvicorn port (default: a free one)")
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--output", type=Path, default=None, help="results JSON (default: benchmarks/results/)")
+    parser.add_argument("--baseline", type=Path, default=None, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="also store the results as the baseline")
+    parser.add_argument("--max-latency-regression", type=float, default=0.10,
+                        help="allowed relative growth of p50/p95/p99 latency")
+    parser.add_argument("--max-throughput-regression", type=float, default=0.10,
+                        help="allowed relative drop of requests/s")
+    args = parser.parse_args()
+    # Set before the app is imported (asgi) or passed to the server's environment (uvicorn)
+    Config.PREDICTION_CACHE_ENABLED = args.cache == "on"
+
+    print(f"target={args.target} executor={Config.INFERENCE_EXECUTOR} backend={Config.INFERENCE_BACKEND} "
+          f"batching={Config.BATCHING_ENABLED} cache={Config.PREDICTION_CACHE_ENABLED}")
+    print(f"{'workload':<12}{'req/s':>10}{'rows/s':>12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    workloads = asyncio.run(run_asgi(args)) if args.target == "asgi" else run_uvicorn(args)
+
+    report = {
+        "target": args.target,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "settings": {key: value for key, value in vars(args).items()
+                     if key in ("requests", "concurrency", "bulk_rows", "bulk_requests", "warmup")},
+        "config": {
+            "executor": Config.INFERENCE_EXECUTOR,
+            "backend": Config.INFERENCE_BACKEND,
+            "batching": Config.BATCHING_ENABLED,
+            "cache": Config.PREDICTION_CACHE_ENABLED,
+        },
+        "workloads": workloads,
+    }
+
+    output = args.output or RESULTS_DIR / f"loadtest_{args.target}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+    if args.save_baseline:
+        baseline_path = args.baseline or BASELINES_DIR / f"loadtest_{args.target}.json"
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f"Baseline saved to {baseline_path}")
+        return
+
+    baseline_path = args.baseline or BASELINES_DIR / f"loadtest_{args.target}.json"
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return
+    regressions = compare(workloads, json.loads(baseline_path.read_text()),
+                          args.max_latency_regression, args.max_throughput_regression)
+    if regressions:
+        print(f"Regressions against {baseline_path}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"No regressions against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
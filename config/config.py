@@ -12,8 +12,16 @@ class Config:
     DATA_PATH = ARTIFACTS_DIR / "boston.csv"
     MODEL_PATH = ARTIFACTS_DIR / "best_model.pkl"
     SCALER_PATH = ARTIFACTS_DIR / "scaler.pkl"
+    BOOSTER_PATH = ARTIFACTS_DIR / "model.ubj"
+    SCALER_PARAMS_PATH = ARTIFACTS_DIR / "scaler.json"
+    FOREST_PATH = ARTIFACTS_DIR / "forest.npz"
+    FOREST_MMAP_DIR = ARTIFACTS_DIR / "forest_mmap"
+    HOLDOUT_PATH = ARTIFACTS_DIR / "holdout.npz"
     METRICS_PATH = ARTIFACTS_DIR / "metrics.json"
     FEATURE_IMPORTANCE_PATH = ARTIFACTS_DIR / "feature_importance.json"
+    TRAINING_STATE_PATH = ARTIFACTS_DIR / "training_state.json"
+    STAGE_CACHE_DIR = ARTIFACTS_DIR / "stage_cache"
+    DATASET_CACHE_DIR = ARTIFACTS_DIR / "dataset_cache"
     
     # Model parameters
     RANDOM_STATE = 42
@@ -40,17 +48,129 @@ class Config:
     # Cross validation settings
     CV_FOLDS = 5
     
+    # Grid walked exhaustively by the "grid" search strategy
+    PARAM_GRID = {
+        'regressor__max_depth': [3, 4, 5, 6],
+        'regressor__learning_rate': [0.01, 0.1],
+        'regressor__n_estimators': [100, 200],
+        'regressor__min_child_weight': [1, 3],
+        'regressor__subsample': [0.8, 0.9],
+        'regressor__colsample_bytree': [0.8, 0.9]
+    }
+    
+    # Hyperparameter search (src/search.py): "grid" (PARAM_GRID), or "random",
+    # "halving" (successive halving) and "tpe" (model-based) sampling PARAMS.
+    # Every strategy stops at the budget: CV fold fits and/or seconds (None = no limit)
+    SEARCH_STRATEGY = "halving"
+    SEARCH_MAX_FITS = 300
+    SEARCH_MAX_SECONDS = None
+    SEARCH_MAX_CANDIDATES = 500
+    HALVING_RESOURCE = "n_estimators"  # or "n_samples" (fraction of each training fold)
+    HALVING_FACTOR = 3
+    TPE_STARTUP_TRIALS = 10
+    # "sklearn" refits the pipeline per fold fit; "native" builds each fold's
+    # QuantileDMatrix once and trains every candidate on it with xgb.train().
+    # Both score identically only with xgboost >= 2.0, where "hist" is the default tree_method
+    SEARCH_BACKEND = "native"
+    
+    # Early stopping in CV: n_estimators leaves the search space; each fold fit
+    # grows up to EARLY_STOPPING_MAX_ESTIMATORS trees and stops once a held-out
+    # fraction of its training rows has not improved for EARLY_STOPPING_ROUNDS.
+    # The final model gets the median best iteration of the winning candidate.
+    # Off by default: on this dataset it halves grid fits but costs ~0.02 test R2
+    EARLY_STOPPING = False
+    EARLY_STOPPING_ROUNDS = 20
+    EARLY_STOPPING_MAX_ESTIMATORS = 300
+    EARLY_STOPPING_VALIDATION_FRACTION = 0.2
+    
+    # Incremental training (train.py --incremental): trees added per update,
+    # fitted on the rows appended to DATA_PATH since the last training, with
+    # the searched learning rate scaled down (full rate overfits small batches)
+    INCREMENTAL_TREES = 20
+    INCREMENTAL_LEARNING_RATE_SCALE = 0.3
+    
+    # Columnar dataset cache (src/dataset.py): DATA_PATH is parsed once into
+    # typed, memory-mapped .npy columns, rebuilt when its content changes
+    DATASET_CACHE = True
+    
+    # Stage cache for train.py (src/stage_cache.py): outputs of each stage are
+    # reused while the data file, the Config fields the stage reads and its
+    # code are unchanged; STAGE_CACHE_KEEP entries are kept per stage
+    STAGE_CACHE = True
+    STAGE_CACHE_KEEP = 5
+    
+    # Training parallelism (src/parallelism.py): cores are split between fits
+    # running side by side (outer) and xgboost threads per fit (inner) so that
+    # outer x inner <= cores. None = automatic (all available cores; as many
+    # concurrent fits as there are tasks)
+    TRAIN_CORES = None
+    TRAIN_OUTER_JOBS = None
+    TRAIN_INNER_THREADS = None
+    
     # Logging configuration
     LOG_FILE = LOGS_DIR / "app.log"
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     LOG_LEVEL = "INFO"
+    LOG_QUEUE_SIZE = 10000  # records waiting for the writer thread; extras are dropped
+    PREDICTION_LOG_SAMPLE_RATE = 0.01  # fraction of /predict calls that are logged
     
     # FastAPI settings
     API_TITLE = "House Price Prediction API"
     API_DESCRIPTION = "API for predicting house prices using the Boston Housing Dataset"
     API_VERSION = "1.0.0"
-    HOST = "0.0.0.0"
-    PORT = 8000
+    HOST = os.environ.get("API_HOST", "0.0.0.0")
+    PORT = int(os.environ.get("API_PORT", "8000"))
+    # uvicorn worker processes started by serve.py
+    WORKERS = int(os.environ.get("API_WORKERS", "1"))
+    
+    # Micro-batching of concurrent /predict requests
+    # A longer window / larger batch trades per-request latency for throughput
+    BATCHING_ENABLED = True
+    BATCH_MAX_SIZE = 64
+    BATCH_WINDOW_MS = 2.0
+    
+    # Streaming CSV predictions: rows parsed and predicted per chunk, and the
+    # upload size kept in memory before it is spooled to a temporary file
+    CSV_CHUNK_SIZE = 10000
+    CSV_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+    # Rows of the returned CSV the Predictions page parses for display
+    CSV_RESULT_PREVIEW_ROWS = 1000
+    
+    # Artifacts the API loads: "native" (booster + scaler.json, falling back to
+    # the pickles when missing) or "pickle" (sklearn pipeline + scaler)
+    MODEL_FORMAT = "native"
+    
+    # Predictor behind the API: "xgboost" (native booster) or "compiled"
+    # (trees flattened into NumPy arrays, see src/tree_compiler.py). With native
+    # artifacts, "compiled" starts without importing xgboost, sklearn or pandas.
+    # It is the default with several workers, where each would otherwise load its
+    # own booster and libraries (see serve.py)
+    INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "compiled" if WORKERS > 1 else "xgboost")
+    # Map the compiled forest read-only from FOREST_MMAP_DIR (shared by all workers)
+    FOREST_MMAP = True
+    
+    # /predict parses the body with orjson into a float row and returns pre-encoded
+    # JSON, skipping pydantic model construction (the OpenAPI schema is unchanged)
+    FAST_PARSE = True
+    
+    # Where model calls run: "inline" (event loop), "thread" or "process" pool
+    INFERENCE_EXECUTOR = "thread"
+    # Pool size per server process; the cores are split between API workers
+    INFERENCE_WORKERS = max(1, (os.cpu_count() or 1) // max(1, WORKERS))
+    
+    # /sensitivity what-if sweeps: default points per axis and max grid size
+    SENSITIVITY_DEFAULT_POINTS = 50
+    SENSITIVITY_MAX_POINTS = 10000
+    
+    # Python client (utils/api_client.py) used by the Streamlit pages
+    API_BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:8000")
+    API_CONNECT_TIMEOUT = 3.05
+    API_READ_TIMEOUT = 60.0
+    API_POOL_SIZE = 8  # kept-alive connections per client
+    API_MAX_RETRIES = 3  # connection errors and 502/503/504, with exponential backoff
+    API_RETRY_BACKOFF = 0.5
+    API_CHUNK_SIZE = 5000  # rows per /bulk_predict request
+    API_MAX_CONCURRENCY = 4  # chunk requests in flight
     
     # Streamlit settings
     STREAMLIT_PORT = 8501
@@ -61,6 +181,13 @@ class Config:
     # Cache settings
     CACHE_TTL = 3600  # 1 hour
     
+    # API prediction cache (LRU + TTL), keyed by the validated feature vector
+    # PRECISION rounds features to that many decimals before lookup (None = exact)
+    PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE", "1") != "0"
+    PREDICTION_CACHE_SIZE = 10000
+    PREDICTION_CACHE_TTL = CACHE_TTL
+    PREDICTION_CACHE_PRECISION = None
+    
     # Feature descriptions for documentation
     FEATURE_DESCRIPTIONS = {
         "CRIM": "Per capita crime rate by town",
@@ -86,6 +213,19 @@ class Config:
         'rmse': 4.0
     }
     
+    # What /bulk_predict does with out-of-range rows: "reject" the whole batch,
+    # "drop" them (null prediction) or "clip" values into the valid range
+    BULK_INVALID_ROW_POLICY = "reject"
+    
+    # Hot model reload: a new model must reach this holdout R2 before it is
+    # swapped in; the artifact watcher polls every MODEL_WATCH_INTERVAL seconds (0 = off)
+    RELOAD_MIN_R2 = METRIC_THRESHOLDS['r2_score']
+    MODEL_WATCH_INTERVAL = 10.0
+    # /admin/reload needs this token in the X-Admin-Token header; with no token set
+    # only loopback clients may call it. Forced reloads are limited to one per interval
+    ADMIN_TOKEN = os.getenv("API_ADMIN_TOKEN") or None
+    ADMIN_FORCED_RELOAD_INTERVAL = 30.0
+    
     # Data validation rules
     DATA_VALIDATION = {
         'CRIM': {'min': 0, 'max': 100},
@@ -110,6 +250,12 @@ class Config:
         """Get the valid range for a feature."""
         return cls.DATA_VALIDATION.get(feature, {'min': float('-inf'), 'max': float('inf')})
     
+    @classmethod
+    def get_feature_bounds(cls, features=None):
+        """Lists of min and max values aligned with the given (or model) feature columns."""
+        ranges = [cls.get_feature_range(feature) for feature in (features or cls.FEATURE_COLUMNS)]
+        return [r['min'] for r in ranges], [r['max'] for r in ranges]
+    
     @classmethod
     def is_valid_feature_value(cls, feature, value):
         """Check if a feature value is within valid range."""
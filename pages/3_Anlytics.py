@@ -4,6 +4,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 from config.config import Config
+from src.dataset import load_dataset, model_columns
 import json
 from utils.styling import load_css
 
@@ -16,7 +17,7 @@ load_css()
 def load_data():
     """Load and cache the dataset"""
     try:
-        return pd.read_csv(Config.DATA_PATH)
+        return load_dataset(model_columns())
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
@@ -1,9 +1,11 @@
+import io
 import streamlit as st
 import pandas as pd
 import numpy as np
 import requests
 import plotly.express as px
 from config.config import Config
+from utils.api_client import APIError, HousePriceClient
 from utils.styling import load_css
 
 st.set_page_config(page_title="Predictions", page_icon="🔮", layout="wide")
@@ -11,6 +13,18 @@ st.set_page_config(page_title="Predictions", page_icon="🔮", layout="wide")
 # Load CSS
 load_css()
 
+@st.cache_resource
+def get_client():
+    # One pooled client per Streamlit process, so clicks reuse open connections
+    return HousePriceClient()
+
+client = get_client()
+
+@st.cache_data(ttl=600, show_spinner=False)
+def what_if_curve(base_items, feature, num):
+    # Keyed on the slider values, so reruns that leave them unchanged reuse the last curve
+    return get_client().sensitivity(dict(base_items), [{"feature": feature, "num": num}])
+
 # Initialize session state
 if 'predictions' not in st.session_state:
     st.session_state.predictions = []
@@ -46,27 +60,62 @@ if st.button("Predict for Manual Input"):
             }
 
             # Send data to API for prediction
-            response = requests.post("http://localhost:8000/predict", json=input_data)
-
-            if response.status_code == 200:
-                prediction = response.json()["prediction"]
-                st.success(f"Predicted Price: ${prediction:.2f}")
-            else:
-                st.error(f"Error making prediction: {response.text}")
+            prediction = client.predict(input_data)["prediction"]
+            st.success(f"Predicted Price: ${prediction:.2f}")
+    except APIError as e:
+        st.error(f"Error making prediction: {e.detail}")
     except requests.exceptions.ConnectionError:
         st.error("Error connecting to the prediction service. Please make sure the API is running.")
     except Exception as e:
         st.error(f"An error occurred: {e}")
 
+# What-if Section: the whole price curve for one feature comes from a single API call
+st.subheader("What-if Analysis")
+current_values = {
+    "LSTAT": LSTAT, "RM": RM, "CRIM": CRIM, "PTRATIO": PTRATIO,
+    "INDUS": INDUS, "TAX": TAX, "NOX": NOX, "B": B
+}
+sweep_feature = st.selectbox(
+    "Feature to vary (others stay at the slider values)",
+    Config.FEATURE_COLUMNS,
+    index=Config.FEATURE_COLUMNS.index("RM")
+)
+
+show_curve = st.checkbox("Show what-if curve", value=False,
+                         help="Calls the API whenever the sliders or the feature change")
+
+if show_curve:
+    try:
+        # Sweep over the feature's valid range, keeping the other inputs valid for the API
+        feature_ranges = {feature: Config.get_feature_range(feature) for feature in Config.FEATURE_COLUMNS}
+        base = {
+            feature: min(max(value, feature_ranges[feature]['min']), feature_ranges[feature]['max'])
+            for feature, value in current_values.items()
+        }
+        curve = what_if_curve(tuple(sorted(base.items())), sweep_feature, Config.SENSITIVITY_DEFAULT_POINTS)
+        curve_df = pd.DataFrame({sweep_feature: curve["grid"][0], "Predicted Price": curve["predictions"]})
+        fig = px.line(curve_df, x=sweep_feature, y="Predicted Price",
+                      title=f"Predicted price as {sweep_feature} changes")
+        fig.add_vline(x=current_values[sweep_feature], line_dash="dash", annotation_text="current")
+        st.plotly_chart(fig, use_container_width=True)
+    except APIError as e:
+        st.error(f"Error computing what-if curve: {e.detail}")
+    except requests.exceptions.ConnectionError:
+        st.error("Error connecting to the prediction service. Please make sure the API is running.")
+    except requests.RequestException as e:
+        st.error(f"Error computing what-if curve: {e}")
+
 # CSV Upload Section
 st.subheader("Upload CSV for Bulk Prediction")
 uploaded_file = st.file_uploader("Upload your CSV file", type=["csv"], help="Upload a CSV file with feature columns.")
 
 if uploaded_file is not None:
     try:
-        data = pd.read_csv(uploaded_file)
+        # Only the first rows are parsed here; the full file is streamed to the API
+        data = pd.read_csv(uploaded_file, nrows=5)
+        uploaded_file.seek(0)
         st.write("### Preview of Uploaded Data")
-        st.dataframe(data.head())
+        st.dataframe(data)
 
         # Validate columns
         required_columns = ["LSTAT", "RM", "CRIM", "PTRATIO", "INDUS", "TAX", "NOX", "B"]
@@ -84,32 +133,27 @@ if uploaded_file is not None:
     if st.button("Predict for Uploaded Data"):
         try:
             with st.spinner('Making predictions...'):
-                # Send data to API for bulk prediction
-                response = requests.post(
-                    "http://localhost:8000/bulk_predict",  # Endpoint for bulk prediction
-                    json=data.to_dict(orient="records")
+                # The raw file goes to the API, which predicts it chunk by chunk;
+                # out-of-range rows get an empty prediction
+                uploaded_file.seek(0)
+                content, _ = client.predict_csv(uploaded_file, filename=uploaded_file.name, invalid_rows="drop")
+                # Only a preview of the result is parsed; the download is the API's CSV as returned
+                data = pd.read_csv(io.BytesIO(content), nrows=Config.CSV_RESULT_PREVIEW_ROWS)
+                st.session_state.predictions = data
+
+                st.success("Predictions completed!")
+                st.write(f"### Prediction Results (first {len(data)} rows)")
+                st.dataframe(data)
+
+                # Option to download predictions
+                st.download_button(
+                    label="Download Predictions",
+                    data=content,
+                    file_name="predictions.csv",
+                    mime="text/csv"
                 )
-
-                if response.status_code == 200:
-                    predictions = response.json()["predictions"]
-
-                    # Combine predictions with original data
-                    data["Predicted Price"] = predictions
-                    st.session_state.predictions = data
-
-                    st.success("Predictions completed!")
-                    st.write("### Prediction Results")
-                    st.dataframe(data)
-
-                    # Option to download predictions
-                    st.download_button(
-                        label="Download Predictions",
-                        data=data.to_csv(index=False).encode('utf-8'),
-                        file_name="predictions.csv",
-                        mime="text/csv"
-                    )
-                else:
-                    st.error(f"Error making prediction: {response.text}")
+        except APIError as e:
+            st.error(f"Error making prediction: {e.detail}")
         except requests.exceptions.ConnectionError:
             st.error("Error connecting to the prediction service. Please make sure the API is running.")
         except Exception as e:
@@ -0,0 +1,32 @@
+import uvicorn
+from config.config import Config
+from src.inference import ensure_mapped_forest, native_artifacts_available
+from utils.logger import setup_logger
+
+logger = setup_logger('serve')
+
+def main():
+    """Run the API with Config.WORKERS uvicorn processes sharing one mapped model.
+
+    Every worker loads the model itself. With API_WORKERS > 1 the backend
+    defaults to "compiled": workers map one read-only forest and never import
+    xgboost, sklearn or pandas. INFERENCE_BACKEND=xgboost still works but
+    costs a private booster plus those libraries per worker (about 115 MB
+    PSS each vs 22 MB compiled, see benchmarks/bench_worker_memory.py).
+    """
+    try:
+        # Build the memory-mapped forest once here instead of racing in every worker
+        if Config.INFERENCE_BACKEND == "compiled" and Config.FOREST_MMAP and native_artifacts_available():
+            ensure_mapped_forest()
+            logger.info(f"Compiled forest mapped from {Config.FOREST_MMAP_DIR}")
+
+        logger.info(f"Starting {Config.WORKERS} API workers on {Config.HOST}:{Config.PORT} "
+                    f"({Config.INFERENCE_WORKERS} inference threads each, backend {Config.INFERENCE_BACKEND})")
+        # Multiple workers need the app as an import string; each worker imports it itself
+        uvicorn.run("app:app", host=Config.HOST, port=Config.PORT, workers=Config.WORKERS)
+    except Exception as e:
+        logger.error(f"Error starting API server: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import asyncio
+from collections import Counter
+import numpy as np
+from utils.logger import setup_logger
+
+logger = setup_logger('batching')
+
+
+class MicroBatcher:
+    """Adaptive micro-batching of concurrent single-row predictions.
+
+    Rows submitted by concurrent requests are queued; the worker task drains
+    everything already waiting and, while traffic is concurrent, keeps
+    collecting for up to ``window_ms`` or until ``max_batch_size`` rows are
+    queued. The batch is predicted with one vectorized ``await predict_fn(X)``
+    call, which returns ``(predictions, model_version)``, and every caller's
+    future is resolved with its own prediction and that version. When traffic
+    is sequential (recent batches of size one) the window is skipped so a lone
+    request does not pay extra latency. Up to ``max_in_flight`` batches are
+    predicted concurrently so an executor pool stays busy.
+    """
+
+    def __init__(self, predict_fn, max_batch_size, window_ms, max_in_flight=1, smoothing=0.1):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000.0
+        self.max_in_flight = max(1, max_in_flight)
+        self.smoothing = smoothing
+        self.batch_sizes = Counter()
+        self.avg_batch_size = 1.0
+        self._queue = None
+        self._task = None
+        self._slots = None
+        self._in_flight = set()
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Start the background batching task on the running loop"""
+        if not self.running:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Cancel the batching task and fail anything still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+
+    async def submit(self, row):
+        """Queue one feature row (in feature column order) and await (prediction, version)"""
+        if not self.running:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, future))
+        return await future
+
+    def stats(self):
+        """Batch size distribution since startup"""
+        batches = sum(self.batch_sizes.values())
+        requests = sum(size * count for size, count in self.batch_sizes.items())
+        return {
+            "batches": batches,
+            "requests": requests,
+            "mean_batch_size": requests / batches if batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "window_ms": self.window * 1000.0,
+            "batch_size_histogram": {str(size): count for size, count in sorted(self.batch_sizes.items())}
+        }
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        # Only hold the batch open while requests are actually arriving concurrently
+        if self.avg_batch_size > 1.5:
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            size = len(batch)
+            self.batch_sizes[size] += 1
+            self.avg_batch_size += self.smoothing * (size - self.avg_batch_size)
+
+            await self._slots.acquire()
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch):
+        try:
+            X = np.array([row for row, _ in batch], dtype=np.float64)
+            predictions, version = await self.predict_fn(X)
+        except Exception as e:
+            logger.error(f"Error predicting batch of {len(batch)}: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+
+        for (_, future), prediction in zip(batch, predictions):
+            if not future.done():
+                future.set_result((float(prediction), version))
@@ -1,42 +1,51 @@
-import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import pickle
 from config.config import Config
+from src.dataset import load_dataset, model_columns
 from utils.logger import setup_logger
 
 logger = setup_logger('data_preparation')
 
-def load_and_prepare_data():
-    """Load and prepare data for modeling"""
+def prepare_data():
+    """Split and scale the dataset; returns the splits, feature names and the fitted scaler"""
+    # Load data
+    logger.info("Loading data...")
+    df = load_dataset(model_columns())
+    
+    # Split features and target
+    X = df[Config.FEATURE_COLUMNS]
+    y = np.log(df[Config.TARGET_COLUMN])
+    
+    # Save feature names
+    feature_names = X.columns.tolist()
+    
+    # Train test split
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, 
+        test_size=Config.TEST_SIZE,
+        random_state=Config.RANDOM_STATE
+    )
+    
+    # Scale features
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+    return X_train_scaled, X_test_scaled, y_train, y_test, feature_names, scaler
+
+def write_scaler(scaler):
+    with open(Config.SCALER_PATH, 'wb') as f:
+        pickle.dump(scaler, f)
+
+def load_and_prepare_data(save_scaler=True):
+    """Load and prepare data for modeling (``save_scaler=False`` leaves the artifact untouched)"""
     try:
-        # Load data
-        logger.info("Loading data from CSV...")
-        df = pd.read_csv(Config.DATA_PATH)
-        
-        # Split features and target
-        X = df[Config.FEATURE_COLUMNS]
-        y = np.log(df[Config.TARGET_COLUMN])
-        
-        # Save feature names
-        feature_names = X.columns.tolist()
-        
-        # Train test split
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, 
-            test_size=Config.TEST_SIZE,
-            random_state=Config.RANDOM_STATE
-        )
-        
-        # Scale features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
+        X_train_scaled, X_test_scaled, y_train, y_test, feature_names, scaler = prepare_data()
         
         # Save scaler
-        with open(Config.SCALER_PATH, 'wb') as f:
-            pickle.dump(scaler, f)
+        if save_scaler:
+            write_scaler(scaler)
         
         logger.info("Data preparation completed successfully")
         return X_train_scaled, X_test_scaled, y_train, y_test, feature_names
@@ -0,0 +1,109 @@
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from config.config import Config
+from utils.files import atomic_path, content_hash
+from utils.logger import setup_logger
+
+logger = setup_logger('dataset')
+
+
+def model_columns():
+    """Columns the model reads: the features plus the target"""
+    return Config.FEATURE_COLUMNS + [Config.TARGET_COLUMN]
+
+
+def _cache_dir(source):
+    return Path(Config.DATASET_CACHE_DIR) / Path(source).stem
+
+
+def _read_meta(directory):
+    try:
+        return json.loads((directory / "meta.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def build_cache(source=None):
+    """Parse the CSV once and store every column as a typed .npy file plus meta.json.
+
+    Columns keep the dtype pandas infers (int64/float64); non-numeric
+    columns are rejected since they cannot be memory-mapped. Files are
+    renamed into place and meta.json is written last, so a reader never
+    sees a half-built cache.
+    """
+    source = Path(source or Config.DATA_PATH)
+    directory = _cache_dir(source)
+    directory.mkdir(parents=True, exist_ok=True)
+    stat = source.stat()
+    df = pd.read_csv(source)
+    non_numeric = [column for column in df.columns if not np.issubdtype(df[column].dtype, np.number)]
+    if non_numeric:
+        raise ValueError(f"Cannot cache non-numeric columns: {', '.join(non_numeric)}")
+
+    for i, column in enumerate(df.columns):
+        values = np.ascontiguousarray(df[column].to_numpy())
+        with atomic_path(directory / f"{i}.npy") as staging:
+            np.save(staging, values)
+    meta = {
+        "source": str(source),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "hash": content_hash(source),
+        "rows": len(df),
+        "columns": list(df.columns),
+        "dtypes": [str(df[column].dtype) for column in df.columns]
+    }
+    with atomic_path(directory / "meta.json") as staging:
+        staging.write_text(json.dumps(meta, indent=4))
+    logger.info(f"Dataset cache built for {source} ({len(df)} rows, {len(df.columns)} columns)")
+    return meta
+
+
+def ensure_cache(source=None):
+    """meta.json of an up-to-date cache for ``source``, rebuilding it only when the content changed.
+
+    The source's mtime and size are checked first; when they differ the
+    content hash decides, so a touched but unchanged file is not reparsed.
+    """
+    source = Path(source or Config.DATA_PATH)
+    directory = _cache_dir(source)
+    meta = _read_meta(directory)
+    stat = source.stat()
+    if meta is not None and (meta["mtime_ns"], meta["size"]) == (stat.st_mtime_ns, stat.st_size):
+        return meta
+    if meta is not None and meta["size"] == stat.st_size and meta["hash"] == content_hash(source):
+        meta.update(mtime_ns=stat.st_mtime_ns)
+        with atomic_path(directory / "meta.json") as staging:
+            staging.write_text(json.dumps(meta, indent=4))
+        return meta
+    return build_cache(source)
+
+
+def load_dataset(columns=None, source=None, mmap=True):
+    """DataFrame of the dataset from the columnar cache (built or refreshed as needed).
+
+    ``columns`` projects the read to those columns (in that order), e.g.
+    ``model_columns()``; only their files are opened. With ``mmap`` the
+    columns are read-only memory maps shared with other processes and paged
+    in on first access; ``mmap=False`` loads writable copies.
+    """
+    try:
+        source = Path(source or Config.DATA_PATH)
+        if not Config.DATASET_CACHE:
+            return pd.read_csv(source, usecols=columns)[columns] if columns else pd.read_csv(source)
+        meta = ensure_cache(source)
+        directory = _cache_dir(source)
+        columns = list(columns or meta["columns"])
+        missing = [column for column in columns if column not in meta["columns"]]
+        if missing:
+            raise KeyError(f"Columns not in {source.name}: {', '.join(missing)}")
+        arrays = {
+            column: np.load(directory / f"{meta['columns'].index(column)}.npy", mmap_mode='r' if mmap else None)
+            for column in columns
+        }
+        return pd.DataFrame(arrays, copy=False)
+    except Exception as e:
+        logger.error(f"Error loading dataset: {str(e)}")
+        raise
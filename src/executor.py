@@ -0,0 +1,115 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+from src.inference import load_serving_engine
+from src.metrics import BATCH_SIZE, STAGE_LATENCY
+from utils.logger import setup_logger
+
+logger = setup_logger('executor')
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+
+# Engine owned by a process-pool worker, loaded once by _init_worker
+_worker_engine = None
+
+
+def _init_worker(loader):
+    """Load the model once per worker process"""
+    global _worker_engine
+    _worker_engine = loader()
+
+
+def _worker_predict_batch(X):
+    predictions, scale_seconds, predict_seconds = _worker_engine.predict_batch_timed(X)
+    return predictions, _worker_engine.version, scale_seconds, predict_seconds
+
+
+def _engine_predict_batch(engine, X):
+    predictions, scale_seconds, predict_seconds = engine.predict_batch_timed(X)
+    return predictions, engine.version, scale_seconds, predict_seconds
+
+
+class InferenceExecutor:
+    """Runs CPU-bound model calls off the event loop.
+
+    Modes:
+      * ``inline``  - call the engine on the event loop (previous behaviour).
+      * ``thread``  - a ThreadPoolExecutor sharing the loaded engine. Booster
+        prediction and the numpy scaling release the GIL, so batches from
+        different requests overlap while the loop keeps accepting requests.
+      * ``process`` - a ProcessPoolExecutor whose workers each load the model
+        once at start-up. Inputs and outputs are pickled across processes, so
+        it pays off for large batches or when Python-side work saturates the GIL.
+
+    Run ``python -m benchmarks.bench_executor`` to measure throughput of each
+    mode on the target machine.
+    """
+
+    def __init__(self, registry, mode="thread", workers=1, loader=load_serving_engine):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode {mode!r}, expected one of {EXECUTOR_MODES}")
+        self.registry = registry
+        self.mode = mode
+        self.workers = max(1, int(workers))
+        self.loader = loader
+        self._pool = None
+
+    def start(self):
+        """Create the worker pool (no-op for inline mode)"""
+        if self._pool is not None or self.mode == "inline":
+            return
+        if self.mode == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        else:
+            # spawn: forking a process that already runs OpenMP threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.loader,)
+            )
+        logger.info(f"Started {self.mode} inference pool with {self.workers} workers")
+
+    async def warmup(self):
+        """Run one prediction per worker so the first requests skip pool start-up"""
+        self.start()
+        X = self.registry.engine.mean[np.newaxis, :]
+        await asyncio.gather(*[self.predict_batch(X, endpoint="warmup") for _ in range(self.workers)])
+
+    def shutdown(self, wait=True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+    async def refresh(self):
+        """Replace process workers so they load the artifacts the registry now serves"""
+        if self.mode != "process" or self._pool is None:
+            return
+        old_pool, self._pool = self._pool, None
+        await self.warmup()
+        # Requests already queued on the old workers finish there
+        old_pool.shutdown(wait=False)
+
+    async def predict_batch(self, X, endpoint="predict"):
+        """Predict prices for a feature matrix; returns (predictions, model version).
+
+        Scaling and model time are measured where the work runs (including
+        inside process workers) and recorded under ``endpoint`` on the loop.
+        """
+        if self.mode == "process":
+            self.start()
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._pool, _worker_predict_batch, X)
+        elif self.mode == "inline":
+            result = _engine_predict_batch(self.registry.engine, X)
+        else:
+            self.start()
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._pool, _engine_predict_batch, self.registry.engine, X)
+
+        predictions, version, scale_seconds, predict_seconds = result
+        STAGE_LATENCY.observe(scale_seconds, endpoint, "scale")
+        STAGE_LATENCY.observe(predict_seconds, endpoint, "predict")
+        BATCH_SIZE.observe(len(X), endpoint)
+        return predictions, version
@@ -0,0 +1,71 @@
+import json
+import pickle
+from contextlib import ExitStack
+import numpy as np
+from config.config import Config
+from src.inference import extract_booster
+from src.tree_compiler import compile_booster
+from utils.files import atomic_path
+from utils.logger import setup_logger
+
+logger = setup_logger('export')
+
+def export_native_artifacts(model, scaler):
+    """Write the booster in xgboost's binary format plus scaler parameters as JSON.
+
+    Also writes the compiled forest so the API can serve with NumPy alone. Each
+    file is written next to its target and renamed into place, so a running
+    API watching the artifacts never reads a half-written file.
+    """
+    try:
+        booster = extract_booster(model)
+        # All three are renamed into place together, only after every write succeeded
+        with ExitStack() as stack:
+            staged = {path: stack.enter_context(atomic_path(path)) for path in
+                      (Config.BOOSTER_PATH, Config.SCALER_PARAMS_PATH, Config.FOREST_PATH)}
+
+            booster.save_model(str(staged[Config.BOOSTER_PATH]))
+
+            scaler_params = {
+                "feature_columns": Config.FEATURE_COLUMNS,
+                "mean": [float(x) for x in scaler.mean_],
+                "scale": [float(x) for x in scaler.scale_]
+            }
+            with open(staged[Config.SCALER_PARAMS_PATH], 'w') as f:
+                json.dump(scaler_params, f, indent=4)
+
+            compile_booster(booster).save(staged[Config.FOREST_PATH])
+
+        logger.info(f"Native artifacts written to {Config.ARTIFACTS_DIR}")
+    except Exception as e:
+        logger.error(f"Error exporting native artifacts: {str(e)}")
+        raise
+
+def export_holdout_sample(X_test, y_test):
+    """Save unscaled test features and log targets used to validate model reloads"""
+    with atomic_path(Config.HOLDOUT_PATH) as staging:
+        np.savez(staging, X=np.asarray(X_test, dtype=np.float64), y=np.asarray(y_test, dtype=np.float64))
+    logger.info(f"Holdout sample of {len(X_test)} rows written to {Config.HOLDOUT_PATH}")
+
+def main():
+    """Export native artifacts and the holdout sample from the pickled model and scaler"""
+    from sklearn.model_selection import train_test_split
+    from src.dataset import load_dataset, model_columns
+
+    with open(Config.MODEL_PATH, 'rb') as f:
+        model = pickle.load(f)
+    with open(Config.SCALER_PATH, 'rb') as f:
+        scaler = pickle.load(f)
+    export_native_artifacts(model, scaler)
+
+    # Same split as src.data_preparation, so the holdout is the original test set
+    df = load_dataset(model_columns())
+    _, X_test, _, y_test = train_test_split(
+        df[Config.FEATURE_COLUMNS], np.log(df[Config.TARGET_COLUMN]),
+        test_size=Config.TEST_SIZE,
+        random_state=Config.RANDOM_STATE
+    )
+    export_holdout_sample(X_test.to_numpy(), y_test.to_numpy())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import copy
+import json
+import pickle
+import time
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from config.config import Config
+from src.dataset import load_dataset, model_columns
+from src.evaluation import compute_metrics, evaluate_model
+from src.export import export_holdout_sample, export_native_artifacts
+from src.inference import extract_booster
+from src.model import create_pipeline
+from src.search import run_search
+from utils.files import atomic_path
+from utils.logger import setup_logger
+
+logger = setup_logger('incremental')
+
+METRIC_NAMES = ('test_r2', 'test_rmse', 'test_mae', 'train_r2')
+TIE_ULPS = 4
+
+
+def load_training_state():
+    """Rows and mode of the last training run, or None before the first recorded run"""
+    if not Config.TRAINING_STATE_PATH.exists():
+        return None
+    with open(Config.TRAINING_STATE_PATH) as f:
+        return json.load(f)
+
+
+def save_training_state(rows, mode, n_trees, updates_since_full=0):
+    state = {"rows": int(rows), "mode": mode, "n_trees": int(n_trees), "updates_since_full": updates_since_full}
+    with atomic_path(Config.TRAINING_STATE_PATH) as staging, open(staging, 'w') as f:
+        json.dump(state, f, indent=4)
+
+
+def split_rows(df):
+    """Train/test split of raw rows, the same one src.data_preparation makes"""
+    X = df[Config.FEATURE_COLUMNS]
+    y = np.log(df[Config.TARGET_COLUMN])
+    if len(df) < 2:
+        # Too few rows to hold any out
+        return X, X.iloc[:0], y, y.iloc[:0]
+    return train_test_split(X, y, test_size=Config.TEST_SIZE, random_state=Config.RANDOM_STATE)
+
+
+def rescale_booster(booster, old_mean, old_scale, new_mean, new_scale):
+    """Booster that routes rows standardized with the new statistics like ``booster`` did with the old.
+
+    Standardization is increasing in every feature, so mapping each split
+    threshold back to raw units and forward with the new mean/scale keeps
+    every row on the same path; leaf values are untouched. Histogram split
+    values are often exactly a training value (which goes right), so new
+    thresholds are moved down by a few times their rounding error to keep
+    those ties going right.
+    """
+    model = json.loads(booster.save_raw(raw_format='json'))
+    for tree in model['learner']['gradient_booster']['model']['trees']:
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float64)
+        features = np.asarray(tree['split_indices'])
+        # xgboost stores the leaf value in split_conditions
+        internal = np.asarray(tree['left_children']) != -1
+        f = features[internal]
+        old_thresholds = conditions[internal].astype(np.float32)
+        thresholds = ((conditions[internal] * old_scale[f] + old_mean[f]) - new_mean[f]) / new_scale[f]
+        # Rounding error of the old float32 threshold carried into new units, plus the new rounding
+        error = (np.abs(np.spacing(old_thresholds)) * old_scale[f] / new_scale[f]
+                 + np.abs(np.spacing(thresholds.astype(np.float32))))
+        conditions[internal] = (thresholds - TIE_ULPS * error).astype(np.float32)
+        tree['split_conditions'] = conditions.tolist()
+    rescaled = xgb.Booster()
+    rescaled.load_model(bytearray(json.dumps(model).encode()))
+    return rescaled
+
+
+def incremental_update(model, scaler, X_new, y_new, n_trees=None):
+    """Add ``n_trees`` (default Config.INCREMENTAL_TREES) trees fitted on new rows to a trained pipeline.
+
+    The hyperparameters of ``model`` are kept, except that the new trees use
+    its learning rate times Config.INCREMENTAL_LEARNING_RATE_SCALE so a
+    small batch of rows cannot pull the ensemble far. The scaler's statistics are
+    updated with ``X_new`` (StandardScaler.partial_fit) and the existing
+    trees are rescaled to the updated feature space before boosting
+    continues from them. Returns the updated (model, scaler); the inputs
+    are left unchanged.
+    """
+    n_trees = n_trees or Config.INCREMENTAL_TREES
+    updated_scaler = copy.deepcopy(scaler).partial_fit(X_new)
+    booster = rescale_booster(extract_booster(model), scaler.mean_, scaler.scale_,
+                              updated_scaler.mean_, updated_scaler.scale_)
+    params = model.get_params()
+    updated_model = clone(model).set_params(
+        regressor__n_estimators=n_trees,
+        regressor__learning_rate=params['regressor__learning_rate'] * Config.INCREMENTAL_LEARNING_RATE_SCALE
+    )
+    updated_model.fit(updated_scaler.transform(X_new), y_new, regressor__xgb_model=booster)
+    # Keep reporting the searched hyperparameters, so later updates start from them again
+    updated_model.set_params(regressor__n_estimators=params['regressor__n_estimators'],
+                             regressor__learning_rate=params['regressor__learning_rate'])
+    return updated_model, updated_scaler
+
+
+def full_retrain(X_train, y_train):
+    """Search and fit from scratch on raw features, without touching the artifacts"""
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X_train)
+    pipeline = create_pipeline()
+    result = run_search(pipeline, X_scaled, y_train)
+    model = clone(pipeline).set_params(**result.best_params).fit(X_scaled, y_train)
+    return model, scaler
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def _n_trees(model):
+    return extract_booster(model).num_boosted_rounds()
+
+
+def run_incremental(compare=False, base_rows=None, n_trees=None):
+    """Update the trained model with the rows appended to Config.DATA_PATH since the last training.
+
+    Old rows keep the split they had; new rows are split the same way and
+    their training part is used for the update. Metrics are computed on the
+    combined test rows; with ``compare`` a full search and retrain on the
+    same split is run too (artifacts are only written for the incremental
+    model). Returns {"incremental": {...}, "full": {...} or None}, or None
+    when there are no new rows.
+    """
+    try:
+        state = load_training_state()
+        base_rows = base_rows or (state or {}).get("rows")
+        if not base_rows:
+            raise ValueError(f"No training state in {Config.TRAINING_STATE_PATH}: "
+                             "run a full training first or pass the number of rows it used")
+
+        df = load_dataset(model_columns())
+        if len(df) <= base_rows:
+            logger.info(f"No new rows since the last training ({len(df)} rows)")
+            return None
+        logger.info(f"Incremental update with {len(df) - base_rows} new rows ({base_rows} already trained on)")
+
+        X_old_train, X_old_test, y_old_train, y_old_test = split_rows(df.iloc[:base_rows])
+        X_new_train, X_new_test, y_new_train, y_new_test = split_rows(df.iloc[base_rows:])
+        X_train, y_train = pd.concat([X_old_train, X_new_train]), pd.concat([y_old_train, y_new_train])
+        X_test, y_test = pd.concat([X_old_test, X_new_test]), pd.concat([y_old_test, y_new_test])
+
+        with open(Config.MODEL_PATH, 'rb') as f:
+            model = pickle.load(f)
+        with open(Config.SCALER_PATH, 'rb') as f:
+            scaler = pickle.load(f)
+
+        (model, scaler), seconds = _timed(incremental_update, model, scaler, X_new_train, y_new_train, n_trees)
+        metrics, _ = evaluate_model(model, scaler.transform(X_train), scaler.transform(X_test),
+                                    y_train, y_test, Config.FEATURE_COLUMNS)
+        report = {"incremental": {**metrics, "seconds": seconds, "n_trees": _n_trees(model)}, "full": None}
+
+        if compare:
+            logger.info("Running a full search and retrain for comparison...")
+            (full_model, full_scaler), full_seconds = _timed(full_retrain, X_train, y_train)
+            full_metrics = compute_metrics(full_model, full_scaler.transform(X_train), full_scaler.transform(X_test),
+                                           y_train, y_test)
+            report["full"] = {**full_metrics, "seconds": full_seconds, "n_trees": _n_trees(full_model)}
+
+        with open(Config.MODEL_PATH, 'wb') as f:
+            pickle.dump(model, f)
+        with open(Config.SCALER_PATH, 'wb') as f:
+            pickle.dump(scaler, f)
+        export_native_artifacts(model, scaler)
+        export_holdout_sample(X_test.to_numpy(), y_test.to_numpy())
+        updates = (state or {}).get("updates_since_full", 0) + 1
+        save_training_state(len(df), "incremental", _n_trees(model), updates)
+
+        for mode, values in report.items():
+            if values is not None:
+                logger.info(f"{mode}: " + ", ".join(f"{name} {values[name]:.4f}" for name in METRIC_NAMES)
+                            + f", {values['n_trees']} trees, {values['seconds']:.1f}s")
+        logger.info(f"{updates} incremental update(s) since the last full training")
+        return report
+
+    except Exception as e:
+        logger.error(f"Error in incremental training: {str(e)}")
+        raise
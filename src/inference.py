@@ -0,0 +1,170 @@
+import json
+import pickle
+import threading
+import time
+import numpy as np
+from config.config import Config
+from utils.files import content_hash
+from src.tree_compiler import CompiledForest, compile_booster, mapped_source_version
+
+
+def extract_booster(model):
+    """Return the xgboost Booster behind a fitted pipeline or regressor"""
+    if hasattr(model, 'named_steps'):
+        model = model.named_steps['regressor']
+    if hasattr(model, 'get_booster'):
+        return model.get_booster()
+    return model
+
+
+class InferenceEngine:
+    """Pandas-free inference on a raw booster with precomputed scaler parameters.
+
+    The scaler's ``mean_``/``scale_`` are stored as contiguous float64 arrays and
+    single rows are written into a preallocated (per-thread) buffer, so the hot
+    path skips DataFrame construction and sklearn's input validation entirely.
+    Predictions are returned on the price scale (``exp`` of the model output).
+    """
+
+    def __init__(self, booster, mean, scale, feature_columns=None, version=None):
+        self.booster = booster
+        self.version = version
+        self.feature_columns = list(feature_columns or Config.FEATURE_COLUMNS)
+        self.mean = np.ascontiguousarray(mean, dtype=np.float64)
+        self.scale = np.ascontiguousarray(scale, dtype=np.float64)
+        self._local = threading.local()
+
+    @classmethod
+    def from_artifacts(cls, model, scaler):
+        """Build an engine from the pickled pipeline and StandardScaler"""
+        return cls(extract_booster(model), scaler.mean_, scaler.scale_)
+
+    @property
+    def n_features(self):
+        return len(self.feature_columns)
+
+    def _row_buffer(self):
+        row = getattr(self._local, 'row', None)
+        if row is None:
+            row = self._local.row = np.empty((1, self.n_features), dtype=np.float64)
+        return row
+
+    def transform(self, X):
+        """Standardize a (n_rows, n_features) matrix like StandardScaler.transform"""
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+    def predict_scaled(self, X_scaled):
+        """Raw model output (log price) for an already scaled matrix"""
+        return self.booster.inplace_predict(X_scaled)
+
+    def predict_batch(self, X):
+        """Predict prices for a (n_rows, n_features) matrix in feature column order"""
+        return np.exp(self.predict_scaled(self.transform(X)))
+
+    def predict_batch_timed(self, X):
+        """predict_batch that also returns the seconds spent scaling and in the model"""
+        start = time.perf_counter()
+        X_scaled = self.transform(X)
+        scaled = time.perf_counter()
+        predictions = np.exp(self.predict_scaled(X_scaled))
+        return predictions, scaled - start, time.perf_counter() - scaled
+
+    def predict_values(self, values):
+        """Predict the price for one row given as a sequence in feature column order"""
+        row = self._row_buffer()
+        row[0, :] = values
+        np.subtract(row, self.mean, out=row)
+        np.divide(row, self.scale, out=row)
+        return float(np.exp(self.predict_scaled(row)[0]))
+
+
+def artifact_version(*paths):
+    """Short content hash identifying a set of model artifacts"""
+    return content_hash(*paths)
+
+
+def load_engine(model_path=None, scaler_path=None, backend=None):
+    """Unpickle the trained pipeline and scaler and wrap them in an InferenceEngine.
+
+    ``backend`` (default ``Config.INFERENCE_BACKEND``) selects the predictor:
+    ``"xgboost"`` uses the booster itself, ``"compiled"`` flattens its trees
+    into a CompiledForest evaluated with NumPy.
+    """
+    model_path = model_path or Config.MODEL_PATH
+    scaler_path = scaler_path or Config.SCALER_PATH
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    with open(scaler_path, 'rb') as f:
+        scaler = pickle.load(f)
+    engine = InferenceEngine.from_artifacts(model, scaler)
+    engine.version = artifact_version(model_path, scaler_path)
+    if (backend or Config.INFERENCE_BACKEND) == "compiled":
+        engine.booster = compile_booster(engine.booster)
+    return engine
+
+
+def ensure_mapped_forest(forest_path=None, directory=None):
+    """Make sure the memory-mappable copy of forest.npz is current; returns its directory"""
+    forest_path = forest_path or Config.FOREST_PATH
+    directory = directory or Config.FOREST_MMAP_DIR
+    version = artifact_version(forest_path)
+    if mapped_source_version(directory) != version:
+        CompiledForest.load(forest_path).save_mapped(directory, source_version=version)
+    return directory
+
+
+def load_native_engine(booster_path=None, scaler_params_path=None, backend=None):
+    """Build an InferenceEngine from the native artifacts written by src.export.
+
+    Neither sklearn nor pandas is needed: the scaler comes from a small JSON
+    file and the ``"compiled"`` backend reads the flattened forest with NumPy
+    alone. The ``"xgboost"`` backend loads the native booster file (note that
+    importing xgboost pulls in sklearn/pandas when they are installed).
+    With ``Config.FOREST_MMAP`` the compiled forest is memory-mapped, so
+    every worker process serving the same artifacts shares its pages.
+    """
+    booster_path = booster_path or Config.BOOSTER_PATH
+    scaler_params_path = scaler_params_path or Config.SCALER_PARAMS_PATH
+    with open(scaler_params_path) as f:
+        scaler_params = json.load(f)
+
+    if (backend or Config.INFERENCE_BACKEND) == "compiled":
+        if Config.FOREST_MMAP:
+            booster = CompiledForest.load_mapped(ensure_mapped_forest())
+        else:
+            booster = CompiledForest.load(Config.FOREST_PATH)
+    else:
+        import xgboost as xgb
+        booster = xgb.Booster(model_file=str(booster_path))
+
+    return InferenceEngine(
+        booster,
+        scaler_params['mean'],
+        scaler_params['scale'],
+        feature_columns=scaler_params['feature_columns'],
+        version=artifact_version(booster_path, scaler_params_path)
+    )
+
+
+def native_artifacts_available():
+    paths = [Config.BOOSTER_PATH, Config.SCALER_PARAMS_PATH]
+    if Config.INFERENCE_BACKEND == "compiled":
+        paths.append(Config.FOREST_PATH)
+    return all(path.exists() for path in paths)
+
+
+def serving_artifact_paths():
+    """Artifact files load_serving_engine reads under the current Config"""
+    if Config.MODEL_FORMAT == "native" and native_artifacts_available():
+        paths = [Config.BOOSTER_PATH, Config.SCALER_PARAMS_PATH]
+        if Config.INFERENCE_BACKEND == "compiled":
+            paths.append(Config.FOREST_PATH)
+        return paths
+    return [Config.MODEL_PATH, Config.SCALER_PATH]
+
+
+def load_serving_engine(backend=None):
+    """Load the engine the API serves, honouring Config.MODEL_FORMAT"""
+    if Config.MODEL_FORMAT == "native" and native_artifacts_available():
+        return load_native_engine(backend=backend)
+    return load_engine(backend=backend)
@@ -0,0 +1,188 @@
+import bisect
+import threading
+import time
+
+# Upper bounds in seconds; fine-grained below 1 ms where the hot path lives
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter keyed by label values"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram keyed by label values.
+
+    ``observe`` is a bisect over the bucket bounds and three increments under
+    an uncontended lock, cheap enough to leave on in production.
+    """
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labelvalues, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, labelvalues, [("le", _format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together in Prometheus text format.
+
+    Collectors are callables returning ``(name, type, help, [(labels, value)])``
+    tuples, used for values that already live elsewhere (cache, batcher).
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, buckets, labelnames=()):
+        metric = Histogram(name, documentation, buckets, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.expose())
+        for collector in self._collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by method, path and status", ("method", "path", "status"))
+REQUEST_ERRORS = REGISTRY.counter(
+    "http_request_errors_total", "Requests that ended in a 5xx or an unhandled exception", ("path",))
+REQUEST_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "End-to-end request latency", LATENCY_BUCKETS, ("path",))
+STAGE_LATENCY = REGISTRY.histogram(
+    "prediction_stage_duration_seconds", "Time spent in each prediction pipeline stage",
+    LATENCY_BUCKETS, ("endpoint", "stage"))
+BATCH_SIZE = REGISTRY.histogram(
+    "inference_batch_rows", "Rows per model call", BATCH_SIZE_BUCKETS, ("endpoint",))
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests and timing them end to end.
+
+    It also stores the arrival time in ``scope["state"]["request_start"]`` so
+    handlers can attribute the time before they run (routing and body
+    parsing) to a ``parse`` stage. Paths outside ``known_paths`` are reported
+    as ``other`` to keep label cardinality bounded. ``known_paths`` is a
+    callable evaluated once, on the first request, when every route is
+    registered.
+    """
+
+    def __init__(self, app, known_paths=None):
+        self.app = app
+        self.known_paths = known_paths
+        self._known = None
+
+    def _path_label(self, scope):
+        path = scope.get("path", "")
+        if self.known_paths is None:
+            return path
+        if self._known is None:
+            self._known = frozenset(self.known_paths())
+        return path if path in self._known else "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        scope.setdefault("state", {})["request_start"] = start
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        path = self._path_label(scope)
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            REQUEST_LATENCY.observe(time.perf_counter() - start, path)
+            REQUESTS.inc(scope.get("method", ""), path, str(status))
+            if status >= 500:
+                REQUEST_ERRORS.inc(path)
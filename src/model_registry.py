@@ -0,0 +1,98 @@
+import threading
+import time
+import numpy as np
+from config.config import Config
+from src.inference import load_serving_engine, serving_artifact_paths
+from utils.logger import setup_logger
+
+logger = setup_logger('model_registry')
+
+
+class ModelValidationError(ValueError):
+    """Raised when a freshly loaded model fails its pre-swap checks"""
+
+
+def load_holdout(path=None):
+    """Raw holdout features and log targets written by src.export, or None"""
+    path = path or Config.HOLDOUT_PATH
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        return data['X'], data['y']
+
+
+def validate_engine(engine, holdout=None):
+    """Warm up an engine and check it on the holdout sample before it serves traffic"""
+    warm = engine.predict_batch(engine.mean[np.newaxis, :])
+    if not np.all(np.isfinite(warm)):
+        raise ModelValidationError("Model returned non-finite predictions during warm-up")
+    if holdout is None:
+        logger.warning("No holdout sample found, skipping holdout validation")
+        return None
+
+    X, y = holdout
+    predictions = np.log(engine.predict_batch(X))
+    if not np.all(np.isfinite(predictions)):
+        raise ModelValidationError("Model returned non-finite predictions on the holdout sample")
+    r2 = 1.0 - np.sum((y - predictions) ** 2) / np.sum((y - np.mean(y)) ** 2)
+    if r2 < Config.RELOAD_MIN_R2:
+        raise ModelValidationError(f"Holdout R2 {r2:.4f} is below {Config.RELOAD_MIN_R2}")
+    return float(r2)
+
+
+class ModelRegistry:
+    """Owns the engine the API serves and swaps it atomically on reload.
+
+    Request handlers read ``registry.engine`` once and use that reference for
+    the whole request, so a swap (a single attribute assignment) never mixes
+    two models within one prediction. Reloads load, warm and validate the new
+    engine before the swap and are serialized by a lock.
+    """
+
+    def __init__(self, loader=load_serving_engine):
+        self.loader = loader
+        self.engine = None
+        self.loaded_at = None
+        self.holdout_r2 = None
+        self.previous_version = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self.engine.version if self.engine is not None else None
+
+    def reload(self, force=False):
+        """Load the current artifacts and swap them in; returns True if the model changed"""
+        with self._lock:
+            engine = self.loader()
+            if not force and self.engine is not None and engine.version == self.engine.version:
+                return False
+            holdout_r2 = validate_engine(engine, load_holdout())
+
+            self.previous_version = self.version
+            self.engine = engine
+            self.loaded_at = time.time()
+            self.holdout_r2 = holdout_r2
+            logger.info(f"Serving model version {engine.version} (previous {self.previous_version})")
+            return True
+
+    def info(self):
+        return {
+            "model_version": self.version,
+            "previous_version": self.previous_version,
+            "loaded_at": self.loaded_at,
+            "holdout_r2": self.holdout_r2,
+            "artifacts": [str(path) for path in serving_artifact_paths()]
+        }
+
+
+def artifact_signature():
+    """Modification times and sizes of the serving artifacts, used by the watcher"""
+    signature = []
+    for path in serving_artifact_paths():
+        try:
+            stat = path.stat()
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append((str(path), None, None))
+    return tuple(signature)
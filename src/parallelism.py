@@ -0,0 +1,44 @@
+import os
+from config.config import Config
+
+
+def available_cores():
+    """Cores this process may run on (respects CPU affinity / container limits)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class ParallelPlan:
+    """How many fits run at once (outer) and how many threads each booster uses (inner)"""
+
+    def __init__(self, outer_jobs, inner_threads, cores):
+        self.outer_jobs = outer_jobs
+        self.inner_threads = inner_threads
+        self.cores = cores
+
+    def __repr__(self):
+        return f"ParallelPlan(outer_jobs={self.outer_jobs}, inner_threads={self.inner_threads}, cores={self.cores})"
+
+
+def plan_parallelism(n_tasks, cores=None, outer_jobs=None, inner_threads=None):
+    """Split the cores between ``n_tasks`` independent fits and the threads inside each.
+
+    Unset values come from Config.TRAIN_CORES / TRAIN_OUTER_JOBS /
+    TRAIN_INNER_THREADS, and otherwise are chosen automatically. Small
+    boosters gain little from extra threads, so the automatic plan runs as
+    many fits side by side as there are tasks (up to the core count) and
+    gives each fit the cores left over. outer x inner never exceeds the
+    cores, which is what prevents oversubscription.
+    """
+    cores = cores or Config.TRAIN_CORES or available_cores()
+    outer_jobs = outer_jobs or Config.TRAIN_OUTER_JOBS
+    inner_threads = inner_threads or Config.TRAIN_INNER_THREADS
+
+    if outer_jobs is None and inner_threads is None:
+        outer_jobs = max(1, min(cores, n_tasks))
+    elif outer_jobs is None:
+        outer_jobs = max(1, min(n_tasks, cores // inner_threads))
+    if inner_threads is None:
+        inner_threads = max(1, cores // outer_jobs)
+    return ParallelPlan(outer_jobs, inner_threads, cores)
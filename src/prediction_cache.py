@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Bounded in-process prediction cache with LRU eviction and TTL expiry.
+
+    Keys are feature rows in ``Config.FEATURE_COLUMNS`` order, optionally
+    rounded to ``precision`` decimals so near-identical inputs share an entry.
+    The cache is bound to a model version; binding a different version (a new
+    model artifact) drops every entry.
+    """
+
+    def __init__(self, maxsize, ttl, precision=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.precision = precision
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, row):
+        if self.precision is None:
+            return tuple(row)
+        return tuple(round(value, self.precision) for value in row)
+
+    def bind(self, version):
+        """Attach the cache to a model version, invalidating it if the version changed"""
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+
+    def get(self, key):
+        """Return the cached prediction for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, version=None):
+        """Store a prediction; results computed by another model version are ignored"""
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "precision": self.precision,
+            "model_version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
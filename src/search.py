@@ -0,0 +1,432 @@
+import itertools
+import math
+import time
+from functools import partial
+import numpy as np
+import xgboost as xgb
+from joblib import Parallel, delayed, parallel_backend
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold
+from config.config import Config
+from src.parallelism import plan_parallelism
+from utils.logger import setup_logger
+
+logger = setup_logger('search')
+
+SEARCH_STRATEGIES = ("grid", "random", "halving", "tpe")
+SEARCH_BACKENDS = ("sklearn", "native")
+HALVING_RESOURCES = ("n_estimators", "n_samples")
+
+N_ESTIMATORS = 'regressor__n_estimators'
+
+
+class SearchBudget:
+    """Stops a search after ``max_fits`` fold fits or ``max_seconds`` of wall-clock time"""
+
+    def __init__(self, max_fits=None, max_seconds=None):
+        self.max_fits = max_fits
+        self.max_seconds = max_seconds
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def remaining_fits(self, used):
+        return math.inf if self.max_fits is None else self.max_fits - used
+
+    def exhausted(self, used):
+        if self.max_seconds is not None and self.elapsed >= self.max_seconds:
+            return True
+        return self.remaining_fits(used) <= 0
+
+
+class SearchResult:
+    """Best candidate of a search plus every scored trial and the compute spent"""
+
+    def __init__(self, strategy, trials, n_fits, seconds, best=None):
+        self.strategy = strategy
+        self.trials = trials
+        self.n_fits = n_fits
+        self.seconds = seconds
+        best = best or max(trials, key=lambda trial: trial['score'])
+        self.best_params = best['params']
+        self.best_score = best['score']
+
+    def report(self):
+        """Summary with the best-so-far score after each trial (score per unit of compute)"""
+        history, best = [], -math.inf
+        for trial in self.trials:
+            best = max(best, trial['score'])
+            history.append({"fits": trial['fits_so_far'], "seconds": trial['seconds_so_far'], "best_score": best})
+        return {
+            "strategy": self.strategy,
+            "best_score": self.best_score,
+            "best_params": self.best_params,
+            "n_trials": len(self.trials),
+            "n_fits": self.n_fits,
+            "seconds": self.seconds,
+            "history": history
+        }
+
+
+def _fit_and_score(pipeline, params, X, y, train, test):
+    model = clone(pipeline).set_params(**params)
+    model.fit(X[train], y[train])
+    return r2_score(y[test], model.predict(X[test])), None
+
+
+def _validation_split(train, validation_fraction):
+    # Deterministic hold-out of the fold's training rows for early stopping
+    order = np.random.default_rng(Config.RANDOM_STATE).permutation(len(train))
+    n_validation = max(1, int(len(train) * validation_fraction))
+    return train[np.sort(order[n_validation:])], train[np.sort(order[:n_validation])]
+
+
+def _fit_and_score_early_stopping(pipeline, params, X, y, train, test, rounds, validation_fraction):
+    """Fit on part of the fold's training rows, stopping when the held-out rest stops improving.
+
+    Returns the test score (at the best iteration) and the number of trees
+    that iteration corresponds to.
+    """
+    fit_rows, validation_rows = _validation_split(train, validation_fraction)
+    model = clone(pipeline).set_params(**params, regressor__early_stopping_rounds=rounds)
+    model.fit(X[fit_rows], y[fit_rows],
+              regressor__eval_set=[(X[validation_rows], y[validation_rows])], regressor__verbose=False)
+    # predict() uses the trees up to best_iteration once early stopping ran
+    return r2_score(y[test], model.predict(X[test])), model.named_steps['regressor'].best_iteration + 1
+
+
+def _native_params(pipeline, params):
+    """xgb.train() parameters and boosting rounds for a pipeline candidate"""
+    regressor = clone(pipeline).set_params(**params).named_steps['regressor']
+    booster_params = {name: value for name, value in regressor.get_xgb_params().items() if value is not None}
+    booster_params['nthread'] = booster_params.pop('n_jobs', None) or 1
+    return booster_params, regressor.n_estimators
+
+
+def _train_and_score_native(booster_params, num_rounds, matrices, y_test, early_stopping_rounds=None):
+    """Train on a fold's prebuilt matrices; same (score, n_trees) contract as _fit_and_score*"""
+    dtrain, dvalid, dtest = matrices
+    if early_stopping_rounds is None:
+        booster = xgb.train(booster_params, dtrain, num_boost_round=num_rounds)
+        return r2_score(y_test, booster.predict(dtest)), None
+    booster = xgb.train(booster_params, dtrain, num_boost_round=num_rounds, evals=[(dvalid, "validation")],
+                        early_stopping_rounds=early_stopping_rounds, verbose_eval=False)
+    n_trees = booster.best_iteration + 1
+    return r2_score(y_test, booster.predict(dtest, iteration_range=(0, n_trees))), n_trees
+
+
+class CVEvaluator:
+    """Scores candidates with K-fold CV (R2), the same folds GridSearchCV(cv=k) uses.
+
+    All (candidate, fold) fits of a call run in one joblib batch, with the
+    cores split between concurrent fits and booster threads by
+    plan_parallelism (``outer_jobs``/``inner_threads`` override it). Fits and
+    elapsed time are accumulated so strategies can enforce their budget.
+
+    With ``early_stopping`` every fold fit grows up to
+    Config.EARLY_STOPPING_MAX_ESTIMATORS trees and stops on a validation
+    split of its training rows; the trial's ``n_estimators`` becomes the
+    median best iteration over the folds.
+
+    The ``sklearn`` backend clones the pipeline for every fit, so xgboost
+    re-quantizes the fold's rows each time. The ``native`` backend builds
+    each fold's QuantileDMatrix once and trains every candidate on it with
+    xgb.train(), running fits on threads (xgboost releases the GIL) so the
+    matrices are shared instead of copied to worker processes.
+    """
+
+    def __init__(self, pipeline, X, y, folds=None, outer_jobs=None, inner_threads=None, early_stopping=False,
+                 backend="sklearn"):
+        if backend not in SEARCH_BACKENDS:
+            raise ValueError(f"Unknown search backend {backend!r}, expected one of {SEARCH_BACKENDS}")
+        self.pipeline = pipeline
+        self.X = np.asarray(X)
+        self.y = np.asarray(y)
+        self.splits = list(KFold(n_splits=folds or Config.CV_FOLDS).split(self.X))
+        self.outer_jobs = outer_jobs
+        self.inner_threads = inner_threads
+        self.early_stopping = early_stopping
+        self.backend = backend
+        self._matrices = {}
+        self.n_fits = 0
+        self.started = time.perf_counter()
+
+    @property
+    def n_folds(self):
+        return len(self.splits)
+
+    def plan(self, n_tasks):
+        return plan_parallelism(n_tasks, outer_jobs=self.outer_jobs, inner_threads=self.inner_threads)
+
+    def _subsample(self, train, fraction):
+        if fraction >= 1.0:
+            return train
+        # Deterministic subset, nested across fractions
+        order = np.random.default_rng(Config.RANDOM_STATE).permutation(len(train))
+        return np.sort(train[order[:max(2, int(len(train) * fraction))]])
+
+    def _fold_matrices(self, fold, train, sample_fraction):
+        """(dtrain, dvalid, dtest) of a fold, built on first use and reused by every candidate"""
+        key = (fold, sample_fraction)
+        if key not in self._matrices:
+            _, test = self.splits[fold]
+            dvalid = None
+            if self.early_stopping:
+                train, validation = _validation_split(train, Config.EARLY_STOPPING_VALIDATION_FRACTION)
+            dtrain = xgb.QuantileDMatrix(self.X[train], self.y[train])
+            if self.early_stopping:
+                dvalid = xgb.QuantileDMatrix(self.X[validation], self.y[validation], ref=dtrain)
+            self._matrices[key] = (dtrain, dvalid, xgb.DMatrix(self.X[test]))
+        return self._matrices[key]
+
+    def _run_sklearn(self, candidates, tasks, plan):
+        if self.early_stopping:
+            score_fold = partial(_fit_and_score_early_stopping, rounds=Config.EARLY_STOPPING_ROUNDS,
+                                 validation_fraction=Config.EARLY_STOPPING_VALIDATION_FRACTION)
+        else:
+            score_fold = _fit_and_score
+        # inner_max_num_threads also caps OpenMP/BLAS threads inside the loky workers
+        with parallel_backend("loky", inner_max_num_threads=plan.inner_threads):
+            return Parallel(n_jobs=plan.outer_jobs)(
+                delayed(score_fold)(self.pipeline, candidates[i], self.X, self.y, train, test)
+                for i, _, train, test in tasks
+            )
+
+    def _run_native(self, candidates, tasks, plan, sample_fraction):
+        rounds = Config.EARLY_STOPPING_ROUNDS if self.early_stopping else None
+        native = [_native_params(self.pipeline, candidate) for candidate in candidates]
+        matrices = {fold: self._fold_matrices(fold, train, sample_fraction) for _, fold, train, _ in tasks}
+        return Parallel(n_jobs=plan.outer_jobs, backend="threading")(
+            delayed(_train_and_score_native)(*native[i], matrices[fold], self.y[test], rounds)
+            for i, fold, _, test in tasks
+        )
+
+    def evaluate(self, candidates, sample_fraction=1.0):
+        """Mean CV score of every candidate; returns one trial dict per candidate"""
+        tasks = [(i, fold, self._subsample(train, sample_fraction), test)
+                 for i in range(len(candidates)) for fold, (train, test) in enumerate(self.splits)]
+        plan = self.plan(len(tasks))
+        fixed = {'regressor__n_jobs': plan.inner_threads}
+        if self.early_stopping:
+            fixed[N_ESTIMATORS] = Config.EARLY_STOPPING_MAX_ESTIMATORS
+        runnable = [{**candidate, **fixed} for candidate in candidates]
+        if self.backend == "native":
+            results = self._run_native(runnable, tasks, plan, sample_fraction)
+        else:
+            results = self._run_sklearn(runnable, tasks, plan)
+        self.n_fits += len(tasks)
+        seconds = time.perf_counter() - self.started
+
+        fold_scores = np.asarray([score for score, _ in results]).reshape(len(candidates), self.n_folds)
+        trials = [{
+            "params": params,
+            "score": float(fold_scores[i].mean()),
+            "fold_scores": fold_scores[i].tolist(),
+            "sample_fraction": sample_fraction,
+            "fits_so_far": self.n_fits,
+            "seconds_so_far": seconds
+        } for i, params in enumerate(candidates)]
+        if self.early_stopping:
+            best_iterations = np.asarray([n_trees for _, n_trees in results]).reshape(len(candidates), self.n_folds)
+            for trial, iterations in zip(trials, best_iterations):
+                trial["best_iterations"] = iterations.tolist()
+                trial["params"] = {**trial["params"], N_ESTIMATORS: int(np.median(iterations))}
+        return trials
+
+
+def _batch_size(evaluator):
+    # Enough candidates per call to keep the parallel workers busy
+    cores = evaluator.plan(math.inf).cores
+    return max(1, math.ceil(cores / evaluator.n_folds))
+
+
+def _evaluate_in_batches(evaluator, candidates, budget):
+    trials = []
+    for start in range(0, len(candidates), _batch_size(evaluator)):
+        remaining = budget.remaining_fits(evaluator.n_fits) // evaluator.n_folds
+        if budget.exhausted(evaluator.n_fits) or remaining < 1:
+            break
+        batch = candidates[start:start + min(_batch_size(evaluator), remaining)]
+        trials.extend(evaluator.evaluate(batch))
+    return trials
+
+
+def _sample(space, rng):
+    return {name: values[rng.integers(len(values))] for name, values in space.items()}
+
+
+def grid_search(evaluator, space, budget, rng):
+    """Every combination of ``space`` in order, until the budget runs out"""
+    names = list(space)
+    candidates = [dict(zip(names, values)) for values in itertools.product(*space.values())]
+    return _evaluate_in_batches(evaluator, candidates, budget)
+
+
+def random_search(evaluator, space, budget, rng, max_candidates=None):
+    """Distinct random combinations of ``space`` until the budget runs out"""
+    candidates = random_candidates(space, rng, max_candidates or Config.SEARCH_MAX_CANDIDATES)
+    return _evaluate_in_batches(evaluator, candidates, budget)
+
+
+def successive_halving(evaluator, space, budget, rng, resource=None, factor=None):
+    """Successive halving: score many candidates cheaply, keep the best 1/factor, grow the resource.
+
+    The resource is ``n_estimators`` (taken out of the sampled space, up to
+    its largest value) or ``n_samples`` (fraction of each training fold).
+    The initial number of candidates is sized so the whole schedule fits
+    the fit budget. Returns (trials, finalists' trials).
+    """
+    resource = resource or Config.HALVING_RESOURCE
+    factor = factor or Config.HALVING_FACTOR
+    if resource not in HALVING_RESOURCES:
+        raise ValueError(f"Unknown halving resource {resource!r}, expected one of {HALVING_RESOURCES}")
+
+    space = dict(space)
+    max_estimators = max(space.pop(N_ESTIMATORS)) if resource == "n_estimators" else None
+    n_combinations = math.prod(len(values) for values in space.values())
+
+    # Not even one candidate fits: refuse like the other strategies instead of overspending
+    if budget.remaining_fits(evaluator.n_fits) < evaluator.n_folds:
+        return [], []
+    # Sum over rungs of n / factor**i candidates is at most n * factor / (factor - 1)
+    fits_per_candidate = evaluator.n_folds * factor / (factor - 1)
+    n_candidates = min(n_combinations, Config.SEARCH_MAX_CANDIDATES,
+                       int(budget.remaining_fits(evaluator.n_fits) // fits_per_candidate)
+                       if budget.max_fits is not None else Config.SEARCH_MAX_CANDIDATES)
+    n_candidates = max(1, n_candidates)
+    n_rungs = max(1, math.floor(math.log(n_candidates, factor)) + 1) if n_candidates > 1 else 1
+    candidates = random_candidates(space, rng, n_candidates)
+
+    trials, rung_trials = [], []
+    for rung in range(n_rungs):
+        if budget.exhausted(evaluator.n_fits):
+            break
+        scale = factor ** (rung - n_rungs + 1)
+        if resource == "n_estimators":
+            n_estimators = max(10, int(round(max_estimators * scale)))
+            batch = [{**candidate, N_ESTIMATORS: n_estimators} for candidate in candidates]
+            rung_trials = evaluator.evaluate(batch)
+        else:
+            rung_trials = evaluator.evaluate(candidates, sample_fraction=scale)
+        for trial in rung_trials:
+            trial["rung"] = rung
+        trials.extend(rung_trials)
+        logger.info(f"Halving rung {rung}: {len(candidates)} candidates, best {max(t['score'] for t in rung_trials):.4f}")
+
+        keep = max(1, len(candidates) // factor)
+        ranked = sorted(range(len(rung_trials)), key=lambda i: rung_trials[i]['score'], reverse=True)
+        candidates = [candidates[i] for i in ranked[:keep]]
+    return trials, rung_trials
+
+
+def random_candidates(space, rng, n):
+    """``n`` distinct random combinations of ``space`` (fewer if the space is smaller)"""
+    n = min(n, math.prod(len(values) for values in space.values()))
+    candidates, seen = [], set()
+    while len(candidates) < n:
+        candidate = _sample(space, rng)
+        key = tuple(candidate.values())
+        if key not in seen:
+            seen.add(key)
+            candidates.append(candidate)
+    return candidates
+
+
+def tpe_search(evaluator, space, budget, rng, n_startup=None, gamma=0.25, n_ei_candidates=24):
+    """Tree-structured Parzen estimator search over a discrete space.
+
+    After ``n_startup`` random trials, each parameter gets a smoothed
+    categorical density over its values from the best ``gamma`` fraction of
+    trials (l) and from the rest (g); the next candidate is the one, among
+    ``n_ei_candidates`` drawn from l, that maximizes l(x)/g(x).
+    """
+    n_startup = n_startup or Config.TPE_STARTUP_TRIALS
+    names = list(space)
+    max_trials = min(math.prod(len(values) for values in space.values()), Config.SEARCH_MAX_CANDIDATES)
+    trials, seen = [], set()
+
+    def density(subset, name):
+        values = space[name]
+        counts = np.ones(len(values))  # add-one prior keeps unseen values possible
+        for trial in subset:
+            counts[values.index(trial['params'][name])] += 1
+        return counts / counts.sum()
+
+    while len(trials) < max_trials and not budget.exhausted(evaluator.n_fits):
+        if budget.remaining_fits(evaluator.n_fits) < evaluator.n_folds:
+            break
+        if len(trials) < n_startup:
+            candidate = _sample(space, rng)
+        else:
+            ranked = sorted(trials, key=lambda trial: trial['score'], reverse=True)
+            n_good = max(1, int(math.ceil(gamma * len(ranked))))
+            good, bad = ranked[:n_good], ranked[n_good:]
+            l_density = {name: density(good, name) for name in names}
+            g_density = {name: density(bad, name) for name in names}
+            best_ratio, candidate = -math.inf, None
+            for _ in range(n_ei_candidates):
+                indices = {name: rng.choice(len(space[name]), p=l_density[name]) for name in names}
+                ratio = sum(math.log(l_density[name][i] / g_density[name][i]) for name, i in indices.items())
+                proposal = {name: space[name][i] for name, i in indices.items()}
+                if tuple(proposal.values()) not in seen and ratio > best_ratio:
+                    best_ratio, candidate = ratio, proposal
+            if candidate is None:
+                candidate = _sample(space, rng)
+        key = tuple(candidate.values())
+        if key in seen:
+            continue
+        seen.add(key)
+        trials.extend(evaluator.evaluate([candidate]))
+    return trials
+
+
+def run_search(pipeline, X, y, strategy=None, budget=None, outer_jobs=None, inner_threads=None,
+               early_stopping=None, backend=None):
+    """Run the configured hyperparameter search and return a SearchResult.
+
+    ``grid`` walks Config.PARAM_GRID exhaustively; ``random``, ``halving``
+    and ``tpe`` sample Config.PARAMS. Every strategy stops at the fit and
+    wall-clock ``budget`` (default: Config.SEARCH_MAX_FITS / SEARCH_MAX_SECONDS).
+    With ``early_stopping`` (default: Config.EARLY_STOPPING) n_estimators is
+    dropped from the space and chosen per candidate by early stopping, and
+    halving uses the ``n_samples`` resource. ``backend`` (default:
+    Config.SEARCH_BACKEND) selects how fold fits are run (see CVEvaluator).
+    """
+    strategy = strategy or Config.SEARCH_STRATEGY
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown search strategy {strategy!r}, expected one of {SEARCH_STRATEGIES}")
+    early_stopping = Config.EARLY_STOPPING if early_stopping is None else early_stopping
+    budget = budget or SearchBudget(Config.SEARCH_MAX_FITS, Config.SEARCH_MAX_SECONDS)
+    evaluator = CVEvaluator(pipeline, X, y, outer_jobs=outer_jobs, inner_threads=inner_threads,
+                            early_stopping=early_stopping, backend=backend or Config.SEARCH_BACKEND)
+    rng = np.random.default_rng(Config.RANDOM_STATE)
+    grid_space, space = Config.PARAM_GRID, Config.PARAMS
+    if early_stopping:
+        grid_space = {name: values for name, values in grid_space.items() if name != N_ESTIMATORS}
+        space = {name: values for name, values in space.items() if name != N_ESTIMATORS}
+    logger.info(f"Starting {strategy} search (max fits {budget.max_fits}, max seconds {budget.max_seconds}, "
+                f"early stopping {early_stopping}, {evaluator.backend} backend)")
+
+    best = None
+    if strategy == "grid":
+        trials = grid_search(evaluator, grid_space, budget, rng)
+    elif strategy == "random":
+        trials = random_search(evaluator, space, budget, rng)
+    elif strategy == "halving":
+        resource = "n_samples" if early_stopping else None
+        trials, finalists = successive_halving(evaluator, space, budget, rng, resource=resource)
+        # Only the last rung was scored with the full resource
+        if finalists:
+            best = max(finalists, key=lambda trial: trial['score'])
+    else:
+        trials = tpe_search(evaluator, space, budget, rng)
+    if not trials:
+        raise RuntimeError(f"The {strategy} search budget allowed no complete candidate evaluation")
+
+    result = SearchResult(strategy, trials, evaluator.n_fits, budget.elapsed, best=best)
+    logger.info(f"{strategy} search: best score {result.best_score:.4f} after {result.n_fits} fits "
+                f"in {result.seconds:.1f}s")
+    return result
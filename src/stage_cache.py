@@ -0,0 +1,109 @@
+import hashlib
+import inspect
+import pickle
+import time
+import sklearn
+import xgboost
+from config.config import Config
+from utils.files import atomic_path, content_hash
+from utils.logger import setup_logger
+
+logger = setup_logger('stage_cache')
+
+
+def config_fingerprint(fields):
+    """Name/value pairs of the Config fields a stage depends on"""
+    return {field: getattr(Config, field) for field in fields}
+
+
+def code_version(*modules):
+    """Hash of the stage's source modules plus the library versions that shape its outputs"""
+    digest = hashlib.sha256(f"xgboost={xgboost.__version__} sklearn={sklearn.__version__}".encode())
+    for module in modules:
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()[:12]
+
+
+class StageRecord:
+    """Outcome of one stage run: cache hit or miss, seconds spent and seconds saved"""
+
+    def __init__(self, stage, key, hit, seconds, saved):
+        self.stage = stage
+        self.key = key
+        self.hit = hit
+        self.seconds = seconds
+        self.saved = saved
+
+
+class StageCache:
+    """Content-addressed cache of pipeline stage outputs.
+
+    A stage's key hashes its inputs (data file hashes or upstream stage
+    keys), the Config fields it reads and its code version, so any change
+    to those reruns the stage and everything downstream of it, while an
+    unchanged key loads the pickled output instead. Stages in ``force``
+    always rerun (``"all"`` forces every stage); a disabled cache runs
+    everything and stores nothing.
+    """
+
+    def __init__(self, directory=None, force=(), enabled=None):
+        self.directory = directory or Config.STAGE_CACHE_DIR
+        self.force = set(force)
+        self.enabled = Config.STAGE_CACHE if enabled is None else enabled
+        self.records = []
+
+    def key(self, stage, inputs=(), config_fields=(), code=""):
+        digest = hashlib.sha256(stage.encode())
+        for value in (list(inputs), config_fingerprint(config_fields), code):
+            digest.update(repr(value).encode())
+        return digest.hexdigest()[:16]
+
+    def _path(self, stage, key):
+        return self.directory / f"{stage}-{key}.pkl"
+
+    def run(self, stage, fn, inputs=(), config_fields=(), code=""):
+        """Return ``(fn(), key)``, loading the output from the cache when the stage key is unchanged"""
+        key = self.key(stage, inputs, config_fields, code)
+        path = self._path(stage, key)
+        forced = stage in self.force or "all" in self.force
+        if self.enabled and not forced and path.exists():
+            start = time.perf_counter()
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            seconds = time.perf_counter() - start
+            self.records.append(StageRecord(stage, key, True, seconds, max(0.0, entry["seconds"] - seconds)))
+            logger.info(f"Stage {stage}: cache hit {key}")
+            return entry["value"], key
+
+        start = time.perf_counter()
+        value = fn()
+        seconds = time.perf_counter() - start
+        self.records.append(StageRecord(stage, key, False, seconds, 0.0))
+        if self.enabled:
+            self._store(stage, path, {"value": value, "seconds": seconds})
+        logger.info(f"Stage {stage}: ran in {seconds:.2f}s{' (forced)' if forced else ''}, key {key}")
+        return value, key
+
+    def _store(self, stage, path, entry):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with atomic_path(path) as staging, open(staging, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Keep only the most recent entries of each stage
+        entries = sorted(self.directory.glob(f"{stage}-*.pkl"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in entries[Config.STAGE_CACHE_KEEP:]:
+            old.unlink(missing_ok=True)
+
+    def summary(self):
+        """Per-stage hit/miss lines plus totals, as logged at the end of train.py"""
+        lines = [f"{record.stage:<10} {'hit ' if record.hit else 'miss'} {record.seconds:8.2f}s"
+                 + (f"  saved {record.saved:.2f}s" if record.hit else "")
+                 for record in self.records]
+        hits = sum(record.hit for record in self.records)
+        saved = sum(record.saved for record in self.records)
+        spent = sum(record.seconds for record in self.records)
+        lines.append(f"{hits}/{len(self.records)} stages from cache, {spent:.2f}s spent, {saved:.2f}s saved")
+        return lines
+
+
+def data_hash(path=None):
+    return content_hash(path or Config.DATA_PATH)
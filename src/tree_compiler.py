@@ -0,0 +1,190 @@
+import json
+from pathlib import Path
+import numpy as np
+from utils.files import atomic_path
+from utils.logger import setup_logger
+
+logger = setup_logger('tree_compiler')
+
+# Objectives whose prediction is the raw margin (no link function)
+IDENTITY_OBJECTIVES = ("reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror")
+
+# Rows x trees node indices per evaluation chunk; small enough to stay in cache
+CHUNK_ELEMENTS = 1 << 16
+
+
+class CompiledForest:
+    """A boosted tree ensemble flattened into packed NumPy arrays.
+
+    All trees share one node table: ``feature``, ``threshold``, ``left``,
+    ``right``, ``default_left`` and ``value`` are indexed by global node id and
+    ``roots`` holds each tree's root. Leaves point to themselves and split on
+    feature 0, so a batch is evaluated by walking every tree for every row at
+    once, ``max_depth`` times, without any per-node Python code. Splits follow
+    xgboost semantics: ``x < threshold`` goes left and missing values follow
+    ``default_left``.
+
+    ``save_mapped``/``load_mapped`` store the arrays as separate ``.npy`` files
+    that are memory-mapped read-only, so several server processes share one
+    copy of the node table through the page cache.
+    """
+
+    ARRAYS = ("feature", "threshold", "left", "right", "default_left", "value", "roots")
+
+    def __init__(self, feature, threshold, left, right, default_left, value, roots,
+                 base_score, max_depth, children=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.base_score = float(base_score)
+        self.max_depth = int(max_depth)
+        # children[2 * node + go_right] replaces two gathers and a where per level
+        self.children = np.stack([left, right], axis=1).ravel() if children is None else children
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def predict_margin(self, X):
+        """Sum of leaf values plus base score (the booster's raw output)"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        n_rows, n_features = X.shape
+        has_missing = bool(np.isnan(X).any())
+        out = np.empty(n_rows, dtype=np.float64)
+        chunk = max(1, CHUNK_ELEMENTS // max(1, self.n_trees))
+        for start in range(0, n_rows, chunk):
+            block = X[start:start + chunk]
+            flat = block.ravel()
+            row_offsets = (np.arange(len(block), dtype=np.int32) * n_features)[:, np.newaxis]
+            idx = np.repeat(self.roots[np.newaxis, :], len(block), axis=0)
+            for _ in range(self.max_depth):
+                x = np.take(flat, row_offsets + np.take(self.feature, idx))
+                go_right = ~(x < np.take(self.threshold, idx))
+                if has_missing:
+                    go_right = np.where(np.isnan(x), ~np.take(self.default_left, idx), go_right)
+                idx = np.take(self.children, idx * 2 + go_right)
+            out[start:start + chunk] = np.take(self.value, idx).sum(axis=1, dtype=np.float64)
+        return out + self.base_score
+
+    def inplace_predict(self, X):
+        """Booster-compatible entry point used by InferenceEngine"""
+        return self.predict_margin(X)
+
+    def save(self, path):
+        """Write the packed arrays to an .npz file"""
+        np.savez(path, base_score=self.base_score, max_depth=self.max_depth,
+                 **{name: getattr(self, name) for name in self.ARRAYS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in cls.ARRAYS}
+            return cls(base_score=float(data['base_score']), max_depth=int(data['max_depth']), **arrays)
+
+    def save_mapped(self, directory, source_version=None):
+        """Write one .npy per array plus meta.json into ``directory`` for load_mapped.
+
+        Files are staged under a per-process name and renamed into place, and
+        meta.json is written last, so concurrent writers and readers never see
+        a partial file; processes that already mapped the old files keep them.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in self.ARRAYS + ("children",):
+            with atomic_path(directory / f"{name}.npy") as staging:
+                np.save(staging, np.ascontiguousarray(getattr(self, name)))
+        meta = {"base_score": self.base_score, "max_depth": self.max_depth, "source_version": source_version}
+        with atomic_path(directory / "meta.json") as staging:
+            staging.write_text(json.dumps(meta))
+
+    @classmethod
+    def load_mapped(cls, directory):
+        """Map the arrays written by save_mapped read-only (shared between processes)"""
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text())
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode='r')
+                  for name in cls.ARRAYS + ("children",)}
+        return cls(base_score=meta['base_score'], max_depth=meta['max_depth'], **arrays)
+
+
+def mapped_source_version(directory):
+    """Version of the forest.npz a mapped directory was built from, or None"""
+    try:
+        return json.loads((Path(directory) / "meta.json").read_text()).get("source_version")
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _parse_base_score(value):
+    # Stored as "3.05E0" by xgboost 2.0 and as "[3.05E0]" by later releases
+    return float(str(value).strip('[]'))
+
+
+def _tree_depth(left, right):
+    depth, frontier = 0, [0]
+    while True:
+        children = [c for node in frontier for c in (left[node], right[node]) if c != -1]
+        if not children:
+            return depth
+        depth, frontier = depth + 1, children
+
+
+def compile_booster(booster):
+    """Flatten a regression xgboost Booster into a CompiledForest"""
+    model = json.loads(booster.save_raw(raw_format='json'))
+    learner = model['learner']
+    trees = learner['gradient_booster']['model']['trees']
+    if learner['objective']['name'] not in IDENTITY_OBJECTIVES:
+        raise ValueError(f"Unsupported objective {learner['objective']['name']!r}")
+    if int(learner['learner_model_param'].get('num_class', 0)) > 1:
+        raise ValueError("Only single-output regression boosters can be compiled")
+
+    feature, threshold, left, right, default_left, value, roots = [], [], [], [], [], [], []
+    max_depth = 0
+    offset = 0
+    for tree in trees:
+        t_left = tree['left_children']
+        t_right = tree['right_children']
+        n_nodes = len(t_left)
+        roots.append(offset)
+        max_depth = max(max_depth, _tree_depth(t_left, t_right))
+        for node in range(n_nodes):
+            is_leaf = t_left[node] == -1
+            feature.append(0 if is_leaf else tree['split_indices'][node])
+            threshold.append(tree['split_conditions'][node])
+            left.append(offset + node if is_leaf else offset + t_left[node])
+            right.append(offset + node if is_leaf else offset + t_right[node])
+            default_left.append(bool(tree['default_left'][node]))
+            # xgboost stores the leaf value in split_conditions
+            value.append(tree['split_conditions'][node] if is_leaf else 0.0)
+        offset += n_nodes
+
+    forest = CompiledForest(
+        feature=np.asarray(feature, dtype=np.int32),
+        threshold=np.asarray(threshold, dtype=np.float32),
+        left=np.asarray(left, dtype=np.int32),
+        right=np.asarray(right, dtype=np.int32),
+        default_left=np.asarray(default_left, dtype=bool),
+        value=np.asarray(value, dtype=np.float32),
+        roots=np.asarray(roots, dtype=np.int32),
+        base_score=_parse_base_score(learner['learner_model_param']['base_score']),
+        max_depth=max_depth
+    )
+    logger.info(f"Compiled {forest.n_trees} trees ({forest.n_nodes} nodes, max depth {max_depth})")
+    return forest
+
+
+def max_abs_error(forest, booster, X):
+    """Largest absolute difference between the compiled and native margins on X"""
+    expected = booster.inplace_predict(np.asarray(X, dtype=np.float32))
+    return float(np.max(np.abs(forest.predict_margin(X) - expected))) if len(X) else 0.0
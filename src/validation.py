@@ -0,0 +1,84 @@
+import numpy as np
+from config.config import Config
+
+INVALID_ROW_POLICIES = ("reject", "drop", "clip")
+
+# Row indices listed per feature in a validation report
+MAX_REPORTED_ROWS = 10
+
+
+class BatchValidator:
+    """Vectorized range checks against Config.DATA_VALIDATION.
+
+    Bounds are precomputed once into arrays aligned with ``feature_columns`` so a
+    whole (n_rows, n_features) batch is checked with one broadcast comparison.
+    NaN never satisfies a bound and is therefore reported as out of range.
+    """
+
+    def __init__(self, feature_columns=None):
+        self.feature_columns = list(feature_columns or Config.FEATURE_COLUMNS)
+        lower, upper = Config.get_feature_bounds(self.feature_columns)
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        # Plain lists are faster than NumPy for a single row
+        self._bounds = list(zip(self.feature_columns, lower, upper))
+
+    def first_violation(self, row):
+        """(feature, value, min, max) of the first out-of-range value in one row, or None"""
+        for (feature, low, high), value in zip(self._bounds, row):
+            if not low <= value <= high:
+                return feature, value, low, high
+        return None
+
+    def invalid_mask(self, X):
+        """Boolean (n_rows, n_features) mask of out-of-range cells"""
+        return ~((X >= self.lower) & (X <= self.upper))
+
+    def report(self, invalid):
+        """Compact summary of an invalid-cell mask: failing row count plus per-feature details"""
+        bad_rows = invalid.any(axis=1)
+        columns = {}
+        for i in np.flatnonzero(invalid.any(axis=0)):
+            rows = np.flatnonzero(invalid[:, i])
+            columns[self.feature_columns[i]] = {
+                "count": int(rows.size),
+                "expected": [float(self.lower[i]), float(self.upper[i])],
+                "rows": rows[:MAX_REPORTED_ROWS].tolist()
+            }
+        return {
+            "invalid_rows": int(bad_rows.sum()),
+            "rows": np.flatnonzero(bad_rows)[:MAX_REPORTED_ROWS].tolist(),
+            "columns": columns
+        }
+
+    def apply_policy(self, X, policy):
+        """Apply an out-of-range policy to a batch.
+
+        Returns ``(X_valid, keep, report)``: the rows to predict, a boolean mask
+        of which input rows they are, and the validation report (None when the
+        batch is clean). ``reject`` raises ValueError carrying the report,
+        ``drop`` removes failing rows and ``clip`` clamps values to the bounds
+        (rows with missing values cannot be clipped and are dropped).
+        """
+        if policy not in INVALID_ROW_POLICIES:
+            raise ValueError(f"Unknown invalid row policy {policy!r}, expected one of {INVALID_ROW_POLICIES}")
+        invalid = self.invalid_mask(X)
+        if not invalid.any():
+            return X, np.ones(len(X), dtype=bool), None
+
+        report = self.report(invalid)
+        if policy == "reject":
+            raise BatchValidationError(report)
+        if policy == "clip":
+            keep = ~np.isnan(X).any(axis=1)
+            return np.clip(X[keep], self.lower, self.upper), keep, report
+        keep = ~invalid.any(axis=1)
+        return X[keep], keep, report
+
+
+class BatchValidationError(ValueError):
+    """A batch contained out-of-range rows under the ``reject`` policy"""
+
+    def __init__(self, report):
+        super().__init__(f"{report['invalid_rows']} rows have out-of-range feature values")
+        self.report = report
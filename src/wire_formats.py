@@ -0,0 +1,206 @@
+import json
+import struct
+import numpy as np
+from config.config import Config
+
+# Media types accepted (Content-Type) and produced (Accept) by /bulk_predict/binary
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MSGPACK = "application/msgpack"
+RAW_FLOAT32 = "application/x-float32-matrix"
+MEDIA_TYPE_ALIASES = {"application/x-msgpack": MSGPACK}
+
+PREDICTION_COLUMN = "Predicted Price"
+
+# Raw float32 layout: uint32 LE header length, comma-separated column names, row-major float32 LE cells
+RAW_HEADER = struct.Struct("<I")
+
+
+class WireFormatError(ValueError):
+    """The request body could not be decoded in its declared format"""
+
+
+class UnsupportedMediaType(ValueError):
+    """No codec (or its optional dependency) for the requested media type"""
+
+
+def normalize_media_type(value):
+    """Lower-cased media type without parameters, resolving aliases"""
+    media_type = (value or "").split(";")[0].strip().lower()
+    return MEDIA_TYPE_ALIASES.get(media_type, media_type)
+
+
+def negotiate(accept, default):
+    """First supported media type in an Accept header, ``default`` for */* or none"""
+    if not accept:
+        return default
+    for candidate in accept.split(","):
+        media_type = normalize_media_type(candidate)
+        if media_type in ("*/*", "application/*"):
+            return default
+        if media_type in ENCODERS:
+            return media_type
+    raise UnsupportedMediaType(f"None of the accepted media types are supported: {accept}")
+
+
+def _ordered_matrix(columns, feature_columns):
+    """Stack named 1-D arrays into a float64 matrix in feature column order"""
+    missing = [feature for feature in feature_columns if feature not in columns]
+    if missing:
+        raise WireFormatError(f"Missing columns: {', '.join(missing)}")
+    lengths = {len(columns[feature]) for feature in feature_columns}
+    if len(lengths) > 1:
+        raise WireFormatError("All feature columns must have the same length")
+    return np.column_stack([np.asarray(columns[feature], dtype=np.float64) for feature in feature_columns])
+
+
+def _reorder(X, names, feature_columns):
+    """Select and reorder the columns of a matrix whose columns are ``names``"""
+    if len(set(names)) != len(names):
+        raise WireFormatError("Duplicate column names in header")
+    missing = [feature for feature in feature_columns if feature not in names]
+    if missing:
+        raise WireFormatError(f"Missing columns: {', '.join(missing)}")
+    if list(names) == list(feature_columns):
+        return X
+    return X[:, [names.index(feature) for feature in feature_columns]]
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        return pyarrow
+    except ImportError:
+        raise UnsupportedMediaType("Arrow IPC support requires the pyarrow package")
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+        return msgpack
+    except ImportError:
+        raise UnsupportedMediaType("msgpack support requires the msgpack package")
+
+
+def decode_arrow(body, feature_columns):
+    """Arrow IPC stream with one numeric column per feature (nulls become NaN)"""
+    pa = _import_pyarrow()
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    except (pa.ArrowInvalid, OSError) as e:
+        # A truncated stream surfaces as an IO error from the reader
+        raise WireFormatError(f"Invalid Arrow IPC stream: {e}")
+    if len(set(table.column_names)) != len(table.column_names):
+        raise WireFormatError("Duplicate column names in Arrow schema")
+    columns = {name: table.column(name).to_numpy() for name in table.column_names if name in feature_columns}
+    return _ordered_matrix(columns, feature_columns)
+
+
+def decode_msgpack(body, feature_columns):
+    """msgpack map, either an ndarray or one array per feature.
+
+    ndarray form: ``{"columns": [...], "dtype": "float32"|"float64", "shape":
+    [rows, cols], "data": <bin, row-major little-endian>}``, decoded with a
+    single ``np.frombuffer``. Columnar form: ``{feature: [values], ...}``.
+    """
+    msgpack = _import_msgpack()
+    try:
+        payload = msgpack.unpackb(body, raw=False)
+    except ValueError as e:
+        raise WireFormatError(f"Invalid msgpack body: {e}")
+    if not isinstance(payload, dict):
+        raise WireFormatError("msgpack body must be a map")
+
+    if "data" in payload:
+        dtype = np.dtype(payload.get("dtype", "float64")).newbyteorder("<")
+        if dtype.kind != "f":
+            raise WireFormatError("msgpack ndarray dtype must be float32 or float64")
+        names = list(payload.get("columns") or feature_columns)
+        data = payload["data"]
+        if not isinstance(data, bytes) or len(data) % (dtype.itemsize * len(names)):
+            raise WireFormatError("msgpack data size does not match its columns")
+        X = np.frombuffer(data, dtype=dtype).reshape(-1, len(names)).astype(np.float64)
+        return _reorder(X, names, feature_columns)
+    return _ordered_matrix(payload, feature_columns)
+
+
+def decode_raw_float32(body, feature_columns):
+    """Raw float32 matrix preceded by a length-prefixed, comma-separated column header"""
+    if len(body) < RAW_HEADER.size:
+        raise WireFormatError("Body is too short for a float32 matrix header")
+    (header_size,) = RAW_HEADER.unpack_from(body)
+    offset = RAW_HEADER.size + header_size
+    if offset > len(body):
+        raise WireFormatError("Header length exceeds the body size")
+    names = body[RAW_HEADER.size:offset].decode("utf-8").split(",")
+    if (len(body) - offset) % (4 * len(names)):
+        raise WireFormatError(f"Body size is not a whole number of {len(names)}-column float32 rows")
+    X = np.frombuffer(body, dtype="<f4", offset=offset).reshape(-1, len(names)).astype(np.float64)
+    return _reorder(X, names, feature_columns)
+
+
+def encode_arrow(predictions, model_version):
+    """One-column Arrow IPC stream; NaN (rows without a prediction) becomes null"""
+    pa = _import_pyarrow()
+    column = pa.array(predictions, type=pa.float64(), mask=np.isnan(predictions))
+    schema = pa.schema([(PREDICTION_COLUMN, pa.float64())], metadata={"model_version": model_version or ""})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(pa.record_batch([column], schema=schema))
+    return sink.getvalue().to_pybytes()
+
+
+def encode_msgpack(predictions, model_version):
+    """msgpack ndarray map of float64 predictions (NaN where a row was dropped)"""
+    msgpack = _import_msgpack()
+    return msgpack.packb({
+        "columns": [PREDICTION_COLUMN],
+        "dtype": "float64",
+        "shape": [len(predictions), 1],
+        "data": np.ascontiguousarray(predictions, dtype="<f8").tobytes(),
+        "model_version": model_version
+    })
+
+
+def encode_raw_float32(predictions, model_version):
+    """float32 predictions in the same header + matrix layout as the request"""
+    header = PREDICTION_COLUMN.encode("utf-8")
+    return RAW_HEADER.pack(len(header)) + header + np.asarray(predictions, dtype="<f4").tobytes()
+
+
+DECODERS = {
+    ARROW_STREAM: decode_arrow,
+    MSGPACK: decode_msgpack,
+    RAW_FLOAT32: decode_raw_float32,
+}
+
+ENCODERS = {
+    ARROW_STREAM: encode_arrow,
+    MSGPACK: encode_msgpack,
+    RAW_FLOAT32: encode_raw_float32,
+}
+
+
+def decode_matrix(body, content_type, feature_columns=None):
+    """Decode a request body into a (n_rows, n_features) float64 matrix in feature order"""
+    media_type = normalize_media_type(content_type)
+    decoder = DECODERS.get(media_type)
+    if decoder is None:
+        raise UnsupportedMediaType(f"Unsupported Content-Type {content_type!r}, expected one of {list(DECODERS)}")
+    try:
+        return decoder(body, list(feature_columns or Config.FEATURE_COLUMNS))
+    except (WireFormatError, UnsupportedMediaType):
+        raise
+    except (ValueError, TypeError, UnicodeDecodeError) as e:
+        # e.g. non-numeric columns or a malformed header
+        raise WireFormatError(f"Could not decode {media_type} body: {e}")
+
+
+def encode_predictions(predictions, media_type, model_version):
+    """Serialize a prediction vector in the negotiated media type"""
+    return ENCODERS[media_type](np.asarray(predictions, dtype=np.float64), model_version)
+
+
+def report_header(report):
+    """Compact JSON validation report for a response header"""
+    return json.dumps(report, separators=(",", ":")) if report else ""
@@ -0,0 +1,55 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+import app
+from config.config import Config
+from utils.api_client import HousePriceClient
+
+ROW = {"LSTAT": 10.0, "RM": 6.0, "CRIM": 1.0, "PTRATIO": 15.0, "INDUS": 10.0, "TAX": 300.0, "NOX": 0.5, "B": 300.0}
+
+
+def frame(n):
+    df = pd.DataFrame([ROW] * n)
+    df["RM"] = np.linspace(4.0, 8.0, n)
+    return df
+
+
+def test_chunks_are_reassembled_in_order_when_they_finish_out_of_order():
+    client = HousePriceClient(chunk_size=3, max_concurrency=4)
+    df = frame(10)
+    started = threading.Barrier(4)
+
+    def predict_chunk(chunk, invalid_rows):
+        # All four chunks start together and the first ones finish last;
+        # each row's RM stands in for its prediction
+        first = chunk.index[0]
+        started.wait()
+        time.sleep(0.05 * (3 - first // 3))
+        return {"predictions": chunk["RM"].tolist(), "model_version": f"chunk{first // 3}"}
+
+    client._predict_chunk = predict_chunk
+    progress = []
+    predictions, results = client.predict_frame(df, progress=lambda done, total: progress.append((done, total)))
+    np.testing.assert_array_equal(predictions, df["RM"].to_numpy())
+    assert [result["model_version"] for result in results] == ["chunk0", "chunk1", "chunk2", "chunk3"]
+    assert [done for done, _ in progress] == [1, 4, 7, 10]
+    assert {total for _, total in progress} == {10}
+
+
+def test_missing_columns_are_rejected():
+    with pytest.raises(ValueError, match="missing columns: B"):
+        HousePriceClient().predict_frame(frame(2).drop(columns="B"))
+
+
+def test_dropped_rows_are_nan_against_the_api():
+    client = HousePriceClient(base_url="http://testserver", chunk_size=4, max_concurrency=2)
+    client.session = TestClient(app.app)
+    df = frame(10)
+    df.loc[[1, 6], "RM"] = Config.DATA_VALIDATION["RM"]["max"] + 1
+    predictions, results = client.predict_frame(df, invalid_rows="drop")
+    assert np.isnan(predictions).nonzero()[0].tolist() == [1, 6]
+    assert np.isfinite(np.delete(predictions, [1, 6])).all()
+    assert [result["validation"]["invalid_rows"] if result.get("validation") else 0 for result in results] == [1, 1, 0]
@@ -0,0 +1,134 @@
+import math
+import numpy as np
+import pytest
+from src.model import create_pipeline
+from src.search import (N_ESTIMATORS, SearchBudget, SearchResult, random_candidates, run_search,
+                        successive_halving, tpe_search)
+
+SPACE = {
+    N_ESTIMATORS: [50, 100, 270],
+    'regressor__max_depth': [2, 3, 4, 5, 6],
+    'regressor__learning_rate': [0.01, 0.05, 0.1, 0.2],
+    'regressor__subsample': [0.6, 0.8, 1.0],
+}
+
+
+class FakeEvaluator:
+    """Stands in for CVEvaluator: deterministic scores, same fit and trial bookkeeping"""
+
+    def __init__(self, n_folds=3):
+        self.n_folds = n_folds
+        self.n_fits = 0
+        self.calls = []
+
+    def evaluate(self, candidates, sample_fraction=1.0):
+        self.calls.append((list(candidates), sample_fraction))
+        self.n_fits += len(candidates) * self.n_folds
+        return [{"params": params, "score": self.score(params) * sample_fraction,
+                 "sample_fraction": sample_fraction, "fits_so_far": self.n_fits, "seconds_so_far": 0.0}
+                for params in candidates]
+
+    @staticmethod
+    def score(params):
+        # Best at max_depth 4 and learning_rate 0.1, more trees always help a little
+        return (-abs(params['regressor__max_depth'] - 4) - abs(params['regressor__learning_rate'] - 0.1)
+                + params.get(N_ESTIMATORS, 0) / 1000)
+
+
+def test_budget():
+    budget = SearchBudget(max_fits=10)
+    assert budget.remaining_fits(4) == 6
+    assert not budget.exhausted(9)
+    assert budget.exhausted(10)
+    assert SearchBudget().remaining_fits(10 ** 6) == math.inf
+    assert SearchBudget(max_seconds=0).exhausted(0)
+
+
+def test_random_candidates_are_distinct_and_capped():
+    rng = np.random.default_rng(0)
+    candidates = random_candidates(SPACE, rng, 20)
+    assert len({tuple(candidate.values()) for candidate in candidates}) == 20
+    small = {'a': [1, 2], 'b': [3]}
+    assert len(random_candidates(small, rng, 10)) == 2
+
+
+def test_halving_on_n_estimators():
+    evaluator = FakeEvaluator()
+    budget = SearchBudget(max_fits=120)
+    trials, finalists = successive_halving(evaluator, SPACE, budget, np.random.default_rng(0),
+                                           resource="n_estimators", factor=3)
+    assert evaluator.n_fits <= budget.max_fits
+    sizes = [len(candidates) for candidates, _ in evaluator.calls]
+    assert sizes == sorted(sizes, reverse=True)
+    assert all(later == max(1, earlier // 3) for earlier, later in zip(sizes, sizes[1:]))
+
+    # The resource grows by the factor each rung and reaches the largest n_estimators last
+    rung_estimators = [candidates[0][N_ESTIMATORS] for candidates, _ in evaluator.calls]
+    assert rung_estimators[-1] == max(SPACE[N_ESTIMATORS])
+    assert rung_estimators == sorted(rung_estimators)
+    assert [trial["rung"] for trial in finalists] == [len(sizes) - 1] * sizes[-1]
+    assert len(trials) == sum(sizes)
+
+    # Each rung keeps the best candidates of the previous one
+    for (candidates, _), (survivors, _) in zip(evaluator.calls, evaluator.calls[1:]):
+        ranked = sorted(candidates, key=FakeEvaluator.score, reverse=True)
+        strip = lambda params: {name: value for name, value in params.items() if name != N_ESTIMATORS}
+        assert [strip(params) for params in survivors] == [strip(params) for params in ranked[:len(survivors)]]
+
+
+def test_halving_on_n_samples():
+    evaluator = FakeEvaluator()
+    successive_halving(evaluator, SPACE, SearchBudget(max_fits=120), np.random.default_rng(0),
+                       resource="n_samples", factor=3)
+    fractions = [fraction for _, fraction in evaluator.calls]
+    assert fractions[-1] == 1.0
+    assert fractions == sorted(fractions)
+    # n_estimators stays a searched parameter
+    assert all(N_ESTIMATORS in params for candidates, _ in evaluator.calls for params in candidates)
+
+
+def test_halving_refuses_a_budget_below_one_candidate():
+    evaluator = FakeEvaluator(n_folds=5)
+    trials, finalists = successive_halving(evaluator, SPACE, SearchBudget(max_fits=4), np.random.default_rng(0))
+    assert (trials, finalists) == ([], [])
+    assert evaluator.n_fits == 0
+
+
+@pytest.mark.parametrize("strategy", ["grid", "random", "halving", "tpe"])
+def test_run_search_without_budget_raises(strategy):
+    X, y = np.random.default_rng(0).normal(size=(30, 8)), np.zeros(30)
+    with pytest.raises(RuntimeError, match="allowed no complete candidate evaluation"):
+        run_search(create_pipeline(), X, y, strategy=strategy, budget=SearchBudget(max_seconds=0))
+
+
+def test_halving_rejects_unknown_resource():
+    with pytest.raises(ValueError, match="Unknown halving resource"):
+        successive_halving(FakeEvaluator(), SPACE, SearchBudget(), np.random.default_rng(0), resource="trees")
+
+
+def test_tpe_respects_budget_and_never_repeats():
+    evaluator = FakeEvaluator()
+    budget = SearchBudget(max_fits=90)
+    trials = tpe_search(evaluator, SPACE, budget, np.random.default_rng(0), n_startup=5)
+    assert evaluator.n_fits <= budget.max_fits
+    assert len(trials) == budget.max_fits // evaluator.n_folds
+    keys = [tuple(trial["params"].values()) for trial in trials]
+    assert len(set(keys)) == len(keys)
+    assert [trial["fits_so_far"] for trial in trials] == [3 * (i + 1) for i in range(len(trials))]
+
+
+def test_tpe_stops_when_space_is_exhausted():
+    space = {'regressor__max_depth': [3, 4], 'regressor__learning_rate': [0.05, 0.1]}
+    trials = tpe_search(FakeEvaluator(), space, SearchBudget(), np.random.default_rng(0), n_startup=2)
+    assert len(trials) == 4
+
+
+def test_search_result_report_tracks_best_so_far():
+    evaluator = FakeEvaluator()
+    trials = tpe_search(evaluator, SPACE, SearchBudget(max_fits=60), np.random.default_rng(1), n_startup=5)
+    result = SearchResult("tpe", trials, evaluator.n_fits, 0.0)
+    report = result.report()
+    best_scores = [point["best_score"] for point in report["history"]]
+    assert best_scores == sorted(best_scores)
+    assert best_scores[-1] == result.best_score == max(trial["score"] for trial in trials)
+    assert report["n_fits"] == evaluator.n_fits
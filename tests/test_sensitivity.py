@@ -0,0 +1,35 @@
+import pytest
+from fastapi.testclient import TestClient
+import app
+from config.config import Config
+
+BASE = {"LSTAT": 10.0, "RM": 6.0, "CRIM": 1.0, "PTRATIO": 15.0, "INDUS": 10.0, "TAX": 300.0, "NOX": 0.5, "B": 300.0}
+
+client = TestClient(app.app)
+
+
+def sweep(axes):
+    return client.post("/sensitivity", json={"base": BASE, "axes": axes})
+
+
+def test_curve_and_grid_shapes():
+    response = sweep([{"feature": "RM", "num": 5}, {"feature": "TAX", "values": [200.0, 300.0]}])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["grid"] == [[3.0, 4.5, 6.0, 7.5, 9.0], [200.0, 300.0]]
+    assert [len(row) for row in body["predictions"]] == [2] * 5
+
+
+@pytest.mark.parametrize("num", [Config.SENSITIVITY_MAX_POINTS + 1, 10 ** 9])
+def test_num_is_capped_by_validation(num):
+    assert sweep([{"feature": "RM", "num": num}]).status_code == 422
+
+
+def test_grid_size_is_checked_before_building_it(monkeypatch):
+    def fail(self):
+        raise AssertionError("grid built for an oversized sweep")
+
+    monkeypatch.setattr(app.SweepAxis, "grid", fail)
+    response = sweep([{"feature": "RM", "num": 5000}, {"feature": "TAX", "num": 5000}])
+    assert response.status_code == 400
+    assert "25000000 points" in response.json()["detail"]
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from config.config import Config
+from src.validation import MAX_REPORTED_ROWS, BatchValidationError, BatchValidator
+
+validator = BatchValidator()
+LOWER, UPPER = (np.asarray(bounds, dtype=np.float64) for bounds in Config.get_feature_bounds())
+RM = Config.FEATURE_COLUMNS.index("RM")
+TAX = Config.FEATURE_COLUMNS.index("TAX")
+
+
+def batch(n=4):
+    """``n`` rows in the middle of every feature's valid range"""
+    return np.tile((LOWER + UPPER) / 2, (n, 1))
+
+
+def test_clean_batch_passes_every_policy():
+    X = batch()
+    for policy in ("reject", "drop", "clip"):
+        X_valid, keep, report = validator.apply_policy(X, policy)
+        assert X_valid is X
+        assert keep.all()
+        assert report is None
+
+
+def test_bounds_are_inclusive():
+    X = np.vstack([LOWER, UPPER])
+    assert not validator.invalid_mask(X).any()
+    assert validator.first_violation(LOWER.tolist()) is None
+
+
+def test_reject_raises_with_report():
+    X = batch()
+    X[1, RM] = UPPER[RM] + 1
+    X[3, TAX] = LOWER[TAX] - 1
+    with pytest.raises(BatchValidationError) as excinfo:
+        validator.apply_policy(X, "reject")
+    report = excinfo.value.report
+    assert report["invalid_rows"] == 2
+    assert report["rows"] == [1, 3]
+    assert report["columns"]["RM"] == {"count": 1, "expected": [LOWER[RM], UPPER[RM]], "rows": [1]}
+    assert set(report["columns"]) == {"RM", "TAX"}
+
+
+def test_drop_removes_failing_rows():
+    X = batch()
+    X[2, RM] = UPPER[RM] + 1
+    X_valid, keep, report = validator.apply_policy(X, "drop")
+    assert keep.tolist() == [True, True, False, True]
+    np.testing.assert_array_equal(X_valid, X[keep])
+    assert report["invalid_rows"] == 1
+
+
+def test_clip_clamps_to_bounds():
+    X = batch()
+    X[0, RM] = UPPER[RM] + 5
+    X[1, TAX] = LOWER[TAX] - 5
+    X_valid, keep, report = validator.apply_policy(X, "clip")
+    assert keep.all()
+    assert X_valid[0, RM] == UPPER[RM]
+    assert X_valid[1, TAX] == LOWER[TAX]
+    assert not validator.invalid_mask(X_valid).any()
+    assert report["invalid_rows"] == 2
+
+
+@pytest.mark.parametrize("policy", ["drop", "clip"])
+def test_nan_rows_are_dropped(policy):
+    X = batch()
+    X[1, RM] = np.nan
+    X_valid, keep, report = validator.apply_policy(X, policy)
+    assert keep.tolist() == [True, False, True, True]
+    assert not np.isnan(X_valid).any()
+    assert report["columns"]["RM"]["rows"] == [1]
+
+
+def test_nan_is_rejected():
+    X = batch()
+    X[0, TAX] = np.nan
+    with pytest.raises(BatchValidationError):
+        validator.apply_policy(X, "reject")
+    assert validator.first_violation(X[0].tolist())[0] == "TAX"
+
+
+def test_report_lists_at_most_max_rows():
+    X = batch(MAX_REPORTED_ROWS + 5)
+    X[:, RM] = UPPER[RM] + 1
+    report = validator.report(validator.invalid_mask(X))
+    assert report["invalid_rows"] == MAX_REPORTED_ROWS + 5
+    assert len(report["rows"]) == MAX_REPORTED_ROWS
+    assert report["columns"]["RM"]["count"] == MAX_REPORTED_ROWS + 5
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError, match="Unknown invalid row policy"):
+        validator.apply_policy(batch(), "ignore")
@@ -0,0 +1,144 @@
+import struct
+import msgpack
+import numpy as np
+import pyarrow as pa
+import pytest
+from fastapi.testclient import TestClient
+import app
+from config.config import Config
+from src.wire_formats import (ARROW_STREAM, MSGPACK, PREDICTION_COLUMN, RAW_FLOAT32, UnsupportedMediaType,
+                              WireFormatError, decode_matrix, encode_predictions, negotiate, normalize_media_type)
+
+FEATURES = Config.FEATURE_COLUMNS
+# Two in-range rows; float32-exact values so the raw format round-trips exactly
+X = np.array([[10.0, 6.0, 1.0, 15.0, 10.0, 300.0, 0.5, 300.0],
+              [5.0, 7.5, 0.25, 18.0, 4.0, 250.0, 0.625, 390.0]])
+
+client = TestClient(app.app)
+
+
+def raw_body(X, names=FEATURES, dtype="<f4"):
+    header = ",".join(names).encode("utf-8")
+    return struct.pack("<I", len(header)) + header + np.asarray(X, dtype=dtype).tobytes()
+
+
+def arrow_body(columns):
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def msgpack_body(X, names=FEATURES, dtype="<f8"):
+    return msgpack.packb({"columns": list(names), "dtype": np.dtype(dtype).name, "shape": list(X.shape),
+                          "data": np.asarray(X, dtype=dtype).tobytes()})
+
+
+def post(body, content_type, accept=None):
+    headers = {"content-type": content_type}
+    if accept:
+        headers["accept"] = accept
+    return client.post("/bulk_predict/binary", content=body, headers=headers)
+
+
+def test_media_type_normalization_and_negotiation():
+    assert normalize_media_type("Application/X-Msgpack; charset=binary") == MSGPACK
+    assert negotiate(None, RAW_FLOAT32) == RAW_FLOAT32
+    assert negotiate("*/*", RAW_FLOAT32) == RAW_FLOAT32
+    assert negotiate(f"text/html, {ARROW_STREAM}", RAW_FLOAT32) == ARROW_STREAM
+    with pytest.raises(UnsupportedMediaType):
+        negotiate("text/html", RAW_FLOAT32)
+
+
+@pytest.mark.parametrize("body, content_type", [
+    (raw_body(X), RAW_FLOAT32),
+    (msgpack_body(X), MSGPACK),
+    (msgpack_body(X, dtype="<f4"), MSGPACK),
+    (msgpack.packb({feature: X[:, i].tolist() for i, feature in enumerate(FEATURES)}), MSGPACK),
+    (arrow_body({feature: X[:, i] for i, feature in enumerate(FEATURES)}), ARROW_STREAM),
+])
+def test_decode_round_trip(body, content_type):
+    np.testing.assert_array_equal(decode_matrix(body, content_type), X)
+
+
+def test_columns_are_remapped_to_feature_order():
+    order = list(reversed(range(len(FEATURES))))
+    names = [FEATURES[i] for i in order]
+    np.testing.assert_array_equal(decode_matrix(raw_body(X[:, order], names), RAW_FLOAT32), X)
+    np.testing.assert_array_equal(decode_matrix(msgpack_body(X[:, order], names), MSGPACK), X)
+    # Extra columns are ignored
+    extra = np.column_stack([X, np.ones(len(X))])
+    np.testing.assert_array_equal(decode_matrix(raw_body(extra, FEATURES + ["ZN"]), RAW_FLOAT32), X)
+
+
+def test_raw_cells_are_little_endian():
+    # Byte-swapped (big-endian) cells decode to other values
+    assert not np.array_equal(decode_matrix(raw_body(X, dtype=">f4"), RAW_FLOAT32), X)
+    np.testing.assert_array_equal(decode_matrix(raw_body(X, dtype="<f4"), RAW_FLOAT32), X)
+
+
+@pytest.mark.parametrize("media_type", [RAW_FLOAT32, MSGPACK, ARROW_STREAM])
+def test_encode_keeps_missing_predictions(media_type):
+    predictions = np.array([1.5, np.nan, 3.25])
+    body = encode_predictions(predictions, media_type, "v1")
+    if media_type == RAW_FLOAT32:
+        (size,) = struct.unpack_from("<I", body)
+        assert body[4:4 + size].decode() == PREDICTION_COLUMN
+        decoded = np.frombuffer(body, dtype="<f4", offset=4 + size)
+    elif media_type == MSGPACK:
+        payload = msgpack.unpackb(body)
+        assert payload["model_version"] == "v1"
+        decoded = np.frombuffer(payload["data"], dtype="<f8")
+    else:
+        decoded = pa.ipc.open_stream(body).read_all().column(PREDICTION_COLUMN).to_numpy(zero_copy_only=False)
+    np.testing.assert_array_equal(decoded, predictions)
+
+
+@pytest.mark.parametrize("body, message", [
+    (b"", "too short"),
+    (b"\x08\x00", "too short"),
+    (struct.pack("<I", 1000) + b"LSTAT", "exceeds the body size"),
+    (struct.pack("<I", 2) + b"\xff\xfe", "Could not decode"),
+    (raw_body(X)[:-2], "whole number"),
+    (raw_body(X[:, :2], FEATURES[:2]), "Missing columns"),
+    (raw_body(np.zeros((1, 2)), ["RM", "RM"]), "Duplicate column names"),
+])
+def test_bad_raw_body(body, message):
+    with pytest.raises(WireFormatError, match=message):
+        decode_matrix(body, RAW_FLOAT32)
+    response = post(body, RAW_FLOAT32)
+    assert response.status_code == 400
+    assert message in response.json()["detail"]
+
+
+@pytest.mark.parametrize("body, content_type", [
+    (b"\xc1", MSGPACK),
+    (msgpack.packb([1, 2]), MSGPACK),
+    (msgpack.packb({"data": b"1234", "dtype": "int32"}), MSGPACK),
+    (msgpack.packb({"data": b"12345"}), MSGPACK),
+    (msgpack.packb({feature: ["a"] for feature in FEATURES}), MSGPACK),
+    (b"not arrow", ARROW_STREAM),
+    (arrow_body(pa.Table.from_arrays([pa.array(X[:, i]) for i in range(len(FEATURES))] + [pa.array(X[:, 1])],
+                                      names=FEATURES + ["RM"])), ARROW_STREAM),
+    (arrow_body({feature: X[:, i] for i, feature in enumerate(FEATURES)})[:-30], ARROW_STREAM),
+])
+def test_bad_body_is_a_client_error(body, content_type):
+    with pytest.raises(WireFormatError):
+        decode_matrix(body, content_type)
+    assert post(body, content_type).status_code == 400
+
+
+def test_endpoint_round_trip():
+    response = post(raw_body(X), RAW_FLOAT32, accept=MSGPACK)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(MSGPACK)
+    payload = msgpack.unpackb(response.content)
+    predictions = np.frombuffer(payload["data"], dtype="<f8")
+    assert predictions.shape == (len(X),)
+    assert payload["model_version"] == response.headers["X-Model-Version"]
+
+
+def test_endpoint_media_type_errors():
+    assert post(raw_body(X), "text/plain").status_code == 415
+    assert post(raw_body(X), RAW_FLOAT32, accept="text/html").status_code == 406
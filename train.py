@@ -1,24 +1,95 @@
-from src.data_preparation import load_and_prepare_data
-from src.model import create_pipeline, train_model
-from src.evaluation import evaluate_model
+import argparse
+from config.config import Config
+from src import data_preparation, evaluation, model as model_module, search
+from src.data_preparation import prepare_data, write_scaler
+from src.model import create_pipeline, refit_best, save_model
+from src.evaluation import compute_evaluation, save_evaluation
+from src.export import export_native_artifacts, export_holdout_sample
+from src.incremental import run_incremental, save_training_state
+from src.search import run_search
+from src.stage_cache import StageCache, code_version, data_hash
 from utils.logger import setup_logger
 
 logger = setup_logger('train')
 
+STAGES = ("prepare", "search", "fit", "evaluate")
+
+# Config fields each cached stage reads; changing one reruns that stage and the ones after it
+PREPARE_CONFIG = ("FEATURE_COLUMNS", "TARGET_COLUMN", "TEST_SIZE", "RANDOM_STATE")
+SEARCH_CONFIG = (
+    "PARAMS", "PARAM_GRID", "CV_FOLDS", "RANDOM_STATE", "SEARCH_STRATEGY", "SEARCH_BACKEND",
+    "SEARCH_MAX_FITS", "SEARCH_MAX_SECONDS", "SEARCH_MAX_CANDIDATES", "HALVING_RESOURCE",
+    "HALVING_FACTOR", "TPE_STARTUP_TRIALS", "EARLY_STOPPING", "EARLY_STOPPING_ROUNDS",
+    "EARLY_STOPPING_MAX_ESTIMATORS", "EARLY_STOPPING_VALIDATION_FRACTION"
+)
+FIT_CONFIG = ("RANDOM_STATE",)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the house price model")
+    parser.add_argument("--incremental", action="store_true",
+                        help="add trees fitted on rows appended since the last training instead of a full search")
+    parser.add_argument("--compare", action="store_true",
+                        help="with --incremental, also run a full retrain and report both metrics")
+    parser.add_argument("--base-rows", type=int, default=None,
+                        help="with --incremental, rows the current model was trained on (default: training state)")
+    parser.add_argument("--trees", type=int, default=None,
+                        help=f"with --incremental, trees to add (default: {Config.INCREMENTAL_TREES})")
+    parser.add_argument("--force", nargs="+", choices=STAGES + ("all",), default=(),
+                        help="rerun these stages even when their cached outputs are still valid")
+    parser.add_argument("--no-cache", action="store_true", help="run every stage and store nothing")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    if args.incremental:
+        run_incremental(compare=args.compare, base_rows=args.base_rows, n_trees=args.trees)
+        return
     try:
+        cache = StageCache(force=args.force, enabled=False if args.no_cache else None)
+
         # Load dan prepare data
         logger.info("Loading and preparing data...")
-        X_train, X_test, y_train, y_test, feature_names = load_and_prepare_data()
+        prepared, prepare_key = cache.run(
+            "prepare", prepare_data, inputs=[data_hash()],
+            config_fields=PREPARE_CONFIG, code=code_version(data_preparation)
+        )
+        X_train, X_test, y_train, y_test, feature_names, scaler = prepared
+        write_scaler(scaler)
 
         # Create dan train model
         logger.info("Creating and training model...")
         pipeline = create_pipeline()
-        model, feature_importance = train_model(pipeline, X_train, y_train, feature_names)
+        result, _ = cache.run(
+            "search", lambda: run_search(pipeline, X_train, y_train), inputs=[prepare_key],
+            config_fields=SEARCH_CONFIG, code=code_version(search, model_module)
+        )
+        logger.info(f"Best parameters: {result.best_params}")
+        logger.info(f"Best score: {result.best_score:.4f} ({result.n_fits} fits in {result.seconds:.1f}s)")
+        # Keyed by the chosen parameters, so a rerun search that picks the same candidate reuses the fit
+        model, fit_key = cache.run(
+            "fit", lambda: refit_best(pipeline, X_train, y_train, result.best_params),
+            inputs=[prepare_key, sorted(result.best_params.items())],
+            config_fields=FIT_CONFIG, code=code_version(model_module)
+        )
+        save_model(model)
 
         # Evaluasi model
         logger.info("Evaluating model...")
-        metrics, _ = evaluate_model(model, X_train, X_test, y_train, y_test, feature_names)
+        (metrics, feature_importance), _ = cache.run(
+            "evaluate", lambda: compute_evaluation(model, X_train, X_test, y_train, y_test, feature_names),
+            inputs=[prepare_key, fit_key], code=code_version(evaluation)
+        )
+        save_evaluation(metrics, feature_importance)
+        logger.info(f"Feature importance: {feature_importance}")
+
+        # Export fast-loading artifacts for the API
+        logger.info("Exporting native model artifacts...")
+        export_native_artifacts(model, scaler)
+        export_holdout_sample(scaler.inverse_transform(X_test), y_test)
+        save_training_state(len(X_train) + len(X_test), "full", model.named_steps['regressor'].get_booster().num_boosted_rounds())
+
+        for line in cache.summary():
+            logger.info(f"Stage cache: {line}")
         
         logger.info("Training completed successfully")
         logger.info(f"Test R2 Score: {metrics['test_r2']:.4f}")
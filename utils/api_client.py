@@ -0,0 +1,125 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config.config import Config
+
+
+class APIError(Exception):
+    """The prediction API answered with an error status"""
+
+    def __init__(self, status_code, detail):
+        super().__init__(f"API error {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class HousePriceClient:
+    """Client for the prediction API over one pooled, keep-alive session.
+
+    Connection errors and 502/503/504 responses are retried with exponential
+    backoff (predictions are idempotent, so POSTs are retried too). Large
+    frames are split into ``chunk_size`` row chunks sent ``max_concurrency``
+    at a time and reassembled in their original order.
+    """
+
+    def __init__(self, base_url=None, timeout=None, pool_size=None, max_retries=None,
+                 backoff_factor=None, chunk_size=None, max_concurrency=None):
+        self.base_url = (base_url or Config.API_BASE_URL).rstrip("/")
+        self.timeout = timeout or (Config.API_CONNECT_TIMEOUT, Config.API_READ_TIMEOUT)
+        self.chunk_size = chunk_size or Config.API_CHUNK_SIZE
+        self.max_concurrency = max_concurrency or Config.API_MAX_CONCURRENCY
+
+        retry = Retry(
+            total=Config.API_MAX_RETRIES if max_retries is None else max_retries,
+            backoff_factor=Config.API_RETRY_BACKOFF if backoff_factor is None else backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "POST"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size or Config.API_POOL_SIZE, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def _request(self, method, path, **kwargs):
+        response = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        if response.status_code != 200:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            raise APIError(response.status_code, detail)
+        return response
+
+    def predict(self, features):
+        """Predict one house from a feature dict; returns {"prediction", "model_version"}"""
+        return self._request("POST", "/predict", json=features).json()
+
+    def sensitivity(self, base, axes):
+        """Price curve/grid from /sensitivity; ``axes`` is a list of {"feature", "start", "stop", "num"} dicts"""
+        return self._request("POST", "/sensitivity", json={"base": base, "axes": axes}).json()
+
+    def model_info(self):
+        return self._request("GET", "/model").json()
+
+    def predict_csv(self, file, filename="upload.csv", invalid_rows="drop"):
+        """Send a CSV file object unparsed to /predict_csv; returns (CSV bytes with predictions, model version).
+
+        The server parses and predicts the upload in chunks, so the client
+        never builds a frame of the whole file.
+        """
+        response = self._request(
+            "POST", "/predict_csv", params={"invalid_rows": invalid_rows},
+            files={"file": (filename, file, "text/csv")}
+        )
+        return response.content, response.headers.get("X-Model-Version")
+
+    def _predict_chunk(self, frame, invalid_rows):
+        payload = {feature: frame[feature].astype(float).tolist() for feature in Config.FEATURE_COLUMNS}
+        return self._request("POST", "/bulk_predict", params={"invalid_rows": invalid_rows}, json=payload).json()
+
+    def predict_frame(self, frame, invalid_rows="drop", progress=None):
+        """Predict every row of a DataFrame holding the feature columns.
+
+        Returns ``(predictions, results)``: a float array aligned with
+        ``frame`` (NaN where a row was dropped) and the per-chunk responses
+        (model version, validation report), in chunk order. ``progress`` is
+        called as ``progress(rows_done, rows_total)`` after each chunk.
+        """
+        missing = [feature for feature in Config.FEATURE_COLUMNS if feature not in frame.columns]
+        if missing:
+            raise ValueError(f"Frame is missing columns: {', '.join(missing)}")
+
+        total = len(frame)
+        starts = list(range(0, total, self.chunk_size))
+        predictions = np.full(total, np.nan)
+        results = [None] * len(starts)
+        done = 0
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(starts)))) as pool:
+            futures = {
+                pool.submit(self._predict_chunk, frame.iloc[start:start + self.chunk_size], invalid_rows): i
+                for i, start in enumerate(starts)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                result = future.result()
+                start = starts[i]
+                chunk = np.array(result["predictions"], dtype=np.float64)  # None -> NaN
+                predictions[start:start + len(chunk)] = chunk
+                results[i] = result
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+        return predictions, results
+
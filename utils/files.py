@@ -0,0 +1,33 @@
+import hashlib
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def content_hash(*paths):
+    """Short content hash of one or more files, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+@contextmanager
+def atomic_path(path):
+    """Yield a staging path next to ``path`` and rename it into place when the block succeeds.
+
+    The staging name is unique per process and keeps the real extension
+    last (np.save, np.savez and xgboost pick the format from it), so
+    concurrent writers never collide and readers only ever see a complete
+    file. On error the staging file is removed and ``path`` is untouched.
+    """
+    path = Path(path)
+    staging = path.with_name(f"{path.stem}.{os.getpid()}.tmp{path.suffix}")
+    try:
+        yield staging
+        os.replace(staging, path)
+    except BaseException:
+        staging.unlink(missing_ok=True)
+        raise
@@ -1,28 +1,100 @@
+import atexit
 import logging
-import os
+import logging.handlers
+import queue
+import random
 from datetime import datetime
-from pathlib import Path
+from config.config import Config
+
+# One background writer per logger name, so repeated setup never duplicates handlers
+_listeners = {}
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that hands raw records to the writer thread.
+
+    The stock QueueHandler formats the message in the calling thread; here the
+    record (with its args) is queued untouched, so string formatting happens
+    in the background. When the queue is full the record is dropped and
+    counted instead of blocking the caller.
+    """
+
+    dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DeferredQueueHandler.dropped += 1
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formatter that appends ``key=value`` pairs passed as ``extra={"fields": {...}}``"""
+
+    def format(self, record):
+        message = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            message = f"{message} " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return message
+
+
+class SampledLogger(logging.LoggerAdapter):
+    """Logger adapter that emits only a random ``rate`` fraction of calls.
+
+    The sampling decision is made before a LogRecord is built, so skipped
+    calls cost a single random draw.
+    """
+
+    def __init__(self, logger, rate):
+        super().__init__(logger, {})
+        self.rate = rate
+
+    def isEnabledFor(self, level):
+        if self.rate < 1 and random.random() >= self.rate:
+            return False
+        return self.logger.isEnabledFor(level)
+
+    def process(self, msg, kwargs):
+        return msg, kwargs
+
+
+def _stop_listeners():
+    for listener in _listeners.values():
+        listener.stop()
+    _listeners.clear()
+
+
+atexit.register(_stop_listeners)
+
 
 def setup_logger(name):
-    """Setup logger with file and console handlers"""
-    # Create logs directory if it doesn't exist
-    log_dir = Path('logs')
-    log_dir.mkdir(exist_ok=True)
-    
+    """Setup logger with file and console handlers fed through a background writer thread"""
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
+    if name in _listeners:
+        return logger
+
+    # Create logs directory if it doesn't exist
+    Config.LOGS_DIR.mkdir(exist_ok=True)
+    logger.setLevel(Config.LOG_LEVEL)
+
     # Create handlers
     c_handler = logging.StreamHandler()
-    f_handler = logging.FileHandler(log_dir / f'{name}_{datetime.now():%Y%m%d}.log')
-    
+    f_handler = logging.FileHandler(Config.LOGS_DIR / f'{name}_{datetime.now():%Y%m%d}.log')
+
     # Create formatters
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    formatter = StructuredFormatter(Config.LOG_FORMAT)
     c_handler.setFormatter(formatter)
     f_handler.setFormatter(formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(c_handler)
-    logger.addHandler(f_handler)
-    
-    return logger
\ No newline at end of file
+
+    # Records are queued by the caller and written by the listener thread
+    log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    listener = logging.handlers.QueueListener(log_queue, c_handler, f_handler, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
+
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    return logger